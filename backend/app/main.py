@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import os
+import time
 from uuid import UUID
 
-from fastapi import FastAPI, File, Form, Header, HTTPException, UploadFile
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, File, Form, Header, HTTPException, Response, UploadFile
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .models import (
     ApproveResponse,
@@ -27,15 +31,121 @@ from .models import (
 )
 from .service import JobService
 
+# Set lookup for the usual camera/browser types; anything else must still be image/*.
+COMMON_IMAGE_CONTENT_TYPES = frozenset(
+    {"image/jpeg", "image/jpg", "image/png", "image/webp", "image/gif", "image/heic", "image/heif"}
+)
+ASSET_CACHE_CONTROL = os.getenv("ASSET_CACHE_CONTROL", "public, max-age=60, must-revalidate")
+HEALTH_CACHE_TTL_SECONDS = 1.0
+UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+UPLOAD_READ_CHUNK_BYTES = 1024 * 1024
+# Room for multipart boundaries and the small form fields next to the image.
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_TOO_LARGE_BODY = b'{"detail":"image too large (max 10MB)"}'
+CORS_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"*"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+]
+
+
+class LiteCORSMiddleware:
+    """Wildcard CORS as a bare ASGI wrapper, without per-request Request/Response objects."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        has_origin = False
+        is_preflight = False
+        for name, _ in scope["headers"]:
+            if name == b"origin":
+                has_origin = True
+            elif name == b"access-control-request-method":
+                is_preflight = True
+        if not has_origin:
+            await self.app(scope, receive, send)
+            return
+        if is_preflight and scope["method"] == "OPTIONS":
+            await send({"type": "http.response.start", "status": 204, "headers": CORS_PREFLIGHT_HEADERS})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"access-control-allow-origin", b"*")]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles that lets clients cache assets and revalidate them against the ETag."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+        return response
+
+
+class UploadSizeLimitMiddleware:
+    """Rejects job uploads whose declared Content-Length is over the cap before the body is received."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == "/v1/jobs":
+            for name, value in scope["headers"]:
+                if name != b"content-length":
+                    continue
+                if value.isdigit() and int(value) > UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD_BYTES:
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": 413,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(UPLOAD_TOO_LARGE_BODY)).encode()),
+                            ],
+                        }
+                    )
+                    await send({"type": "http.response.body", "body": UPLOAD_TOO_LARGE_BODY})
+                    return
+                break
+        await self.app(scope, receive, send)
+
+
+async def _read_upload_capped(image: UploadFile) -> bytes:
+    # Multipart parsing already spooled the part; read it back in chunks so an
+    # oversized file is rejected before it is materialized as one bytes object.
+    if image.size is not None and image.size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="image too large (max 10MB)")
+    buffer = bytearray()
+    while chunk := await image.read(UPLOAD_READ_CHUNK_BYTES):
+        buffer += chunk
+        if len(buffer) > UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="image too large (max 10MB)")
+    return bytes(buffer)
+
+
+def _model_response(model: BaseModel, status_code: int = 200) -> Response:
+    # Routes keep response_model for the OpenAPI schema; returning a Response
+    # skips FastAPI's revalidation and serializes in one pydantic-core call.
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
+
+
 app = FastAPI(title="Musinsa Shorts Generator API", version="1.0.0")
 service = JobService()
-app.mount("/assets", StaticFiles(directory=str(service.asset_root), check_dir=False), name="assets")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# (service, monotonic timestamp, serialized body) of the last /healthz answer.
+_health_cache: tuple[JobService | None, float, bytes] = (None, 0.0, b"")
+app.mount("/assets", AssetStaticFiles(directory=str(service.asset_root), check_dir=False), name="assets")
+app.add_middleware(UploadSizeLimitMiddleware)
+app.add_middleware(LiteCORSMiddleware)
 
 
 @app.post("/v1/jobs", response_model=CreateJobResponse, status_code=202)
@@ -47,13 +157,14 @@ async def create_job(
     theme: str | None = Form(default=None),
     tone: str | None = Form(default=None),
     idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
-) -> CreateJobResponse:
-    if image.content_type is None or not image.content_type.startswith("image/"):
+) -> Response:
+    content_type = image.content_type
+    if content_type not in COMMON_IMAGE_CONTENT_TYPES and (content_type is None or not content_type.startswith("image/")):
         raise HTTPException(status_code=422, detail="image content type must be image/*")
-    content = await image.read()
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="image too large (max 10MB)")
-    return service.create_job(
+    content = await _read_upload_capped(image)
+    # Saving the upload and persisting state block on the service lock and disk.
+    created = await run_in_threadpool(
+        service.create_job,
         look_count=look_count,
         quality_mode=quality_mode,
         target_gender=target_gender,
@@ -63,71 +174,74 @@ async def create_job(
         image_content_type=image.content_type,
         idempotency_key=idempotency_key,
     )
+    return _model_response(created, status_code=202)
 
 
 @app.get("/v1/jobs/{job_id}", response_model=JobDetailResponse)
-async def get_job(job_id: UUID) -> JobDetailResponse:
-    return service.get_job(job_id)
+def get_job(job_id: UUID) -> Response:
+    return _model_response(service.get_job(job_id))
 
 
 @app.post("/v1/jobs/{job_id}/rerank", response_model=RerankResponse)
-async def rerank_job(job_id: UUID, request: RerankRequest) -> RerankResponse:
-    return service.rerank(job_id, request)
+def rerank_job(job_id: UUID, request: RerankRequest) -> Response:
+    return _model_response(service.rerank(job_id, request))
 
 
 @app.post("/v1/jobs/{job_id}/approve", response_model=ApproveResponse)
-async def approve_job(job_id: UUID) -> ApproveResponse:
-    return service.approve(job_id)
+def approve_job(job_id: UUID) -> Response:
+    return _model_response(service.approve(job_id))
 
 
 @app.post("/v1/jobs/{job_id}/retry", response_model=RetryResponse, status_code=202)
-async def retry_job(job_id: UUID) -> RetryResponse:
-    return service.retry(job_id)
+def retry_job(job_id: UUID) -> Response:
+    return _model_response(service.retry(job_id), status_code=202)
 
 
 @app.post("/v1/jobs/{job_id}/publish", response_model=PublishResponse)
-async def publish_job(job_id: UUID) -> PublishResponse:
-    return service.publish_youtube(job_id)
+def publish_job(job_id: UUID) -> Response:
+    return _model_response(service.publish_youtube(job_id))
 
 
 @app.post("/v1/catalog/crawl/jobs", response_model=CatalogCrawlJobResponse, status_code=202)
-async def start_catalog_crawl(limit_per_category: int = 300, mode: CrawlMode = CrawlMode.incremental) -> CatalogCrawlJobResponse:
-    if limit_per_category < 300:
-        limit_per_category = 300
-    if limit_per_category > 1000:
-        limit_per_category = 1000
-    return service.start_catalog_crawl(limit_per_category=limit_per_category, mode=mode)
+def start_catalog_crawl(limit_per_category: int = 300, mode: CrawlMode = CrawlMode.incremental) -> Response:
+    # Out-of-range values are clamped rather than rejected; clients rely on that.
+    limit_per_category = min(max(limit_per_category, 300), 1000)
+    crawl_job = service.start_catalog_crawl(limit_per_category=limit_per_category, mode=mode)
+    return _model_response(crawl_job, status_code=202)
 
 
 @app.get("/v1/catalog/crawl/jobs/{crawl_job_id}", response_model=CatalogCrawlJobDetailResponse)
-async def get_catalog_crawl_job(crawl_job_id: UUID) -> CatalogCrawlJobDetailResponse:
-    return service.get_catalog_crawl_job(crawl_job_id)
+def get_catalog_crawl_job(crawl_job_id: UUID) -> Response:
+    return _model_response(service.get_catalog_crawl_job(crawl_job_id))
 
 
 @app.post("/v1/catalog/index/rebuild", response_model=CatalogIndexRebuildResponse)
-async def rebuild_catalog_index() -> CatalogIndexRebuildResponse:
-    return service.rebuild_catalog_index()
+def rebuild_catalog_index() -> Response:
+    return _model_response(service.rebuild_catalog_index())
 
 
 @app.get("/v1/catalog/stats", response_model=CatalogStatsResponse)
-async def catalog_stats() -> CatalogStatsResponse:
-    return service.catalog_stats()
+def catalog_stats() -> Response:
+    return _model_response(service.catalog_stats())
 
 
 @app.get("/v1/history", response_model=HistoryResponse)
-async def list_history(limit: int = 20) -> HistoryResponse:
-    if limit < 1:
-        limit = 1
-    if limit > 100:
-        limit = 100
-    return service.history(limit)
+def list_history(limit: int = 20) -> Response:
+    limit = min(max(limit, 1), 100)
+    return _model_response(service.history(limit))
 
 
 @app.get("/healthz", response_model=HealthResponse)
-async def healthz() -> HealthResponse:
-    return service.health()
+def healthz() -> Response:
+    global _health_cache
+    cached_service, cached_at, body = _health_cache
+    now = time.monotonic()
+    if cached_service is not service or now - cached_at >= HEALTH_CACHE_TTL_SECONDS:
+        body = service.health().model_dump_json().encode()
+        _health_cache = (service, now, body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/v1/metrics", response_model=MetricsResponse)
-async def metrics() -> MetricsResponse:
-    return service.metrics()
+def metrics() -> Response:
+    return _model_response(service.metrics())
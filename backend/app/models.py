@@ -1,25 +1,26 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
-class QualityMode(str, Enum):
+class QualityMode(StrEnum):
     auto_gate = "auto_gate"
     human_review = "human_review"
 
 
-class TargetGender(str, Enum):
+class TargetGender(StrEnum):
     men = "men"
     women = "women"
     unisex = "unisex"
 
 
-class JobStatus(str, Enum):
+class JobStatus(StrEnum):
     INGESTED = "INGESTED"
     ANALYZED = "ANALYZED"
     MATCHED_PARTIAL = "MATCHED_PARTIAL"
@@ -31,7 +32,7 @@ class JobStatus(str, Enum):
     FAILED = "FAILED"
 
 
-class FailureCode(str, Enum):
+class FailureCode(StrEnum):
     CRAWL_TIMEOUT = "CRAWL_TIMEOUT"
     EMPTY_RESULT = "EMPTY_RESULT"
     RENDER_ERROR = "RENDER_ERROR"
@@ -39,21 +40,21 @@ class FailureCode(str, Enum):
     LICENSE_BLOCKED = "LICENSE_BLOCKED"
 
 
-class YouTubeUploadStatus(str, Enum):
+class YouTubeUploadStatus(StrEnum):
     PENDING = "PENDING"
     SKIPPED = "SKIPPED"
     UPLOADED = "UPLOADED"
     FAILED = "FAILED"
 
 
-class CrawlJobStatus(str, Enum):
+class CrawlJobStatus(StrEnum):
     QUEUED = "QUEUED"
     RUNNING = "RUNNING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
 
-class CrawlMode(str, Enum):
+class CrawlMode(StrEnum):
     incremental = "incremental"
     full = "full"
 
@@ -87,6 +88,12 @@ class MatchItem(BaseModel):
     score_breakdown: Optional[ScoreBreakdown] = None
     failure_code: Optional[FailureCode] = None
 
+    @field_validator("evidence_tags", mode="after")
+    @classmethod
+    def _intern_evidence_tags(cls, tags: list[str]) -> list[str]:
+        # The tag vocabulary is tiny; share one string object per tag across all jobs.
+        return [sys.intern(tag) for tag in tags]
+
 
 class CreateJobResponse(BaseModel):
     job_id: UUID
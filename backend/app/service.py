@@ -1,27 +1,37 @@
 from __future__ import annotations
 
+import array
+import atexit
 import csv
 import colorsys
+import functools
 import json
 import hashlib
+import logging
+import heapq
 import math
 import os
+import queue
 import random
 import re
 import shutil
+import struct
 import subprocess
+import sys
 import threading
 import time
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
-from typing import Optional
-from urllib.parse import quote_plus, urljoin, urlparse
+from typing import Iterator, Optional
+from urllib.parse import quote_plus, urljoin
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 
 from .models import (
     ApproveResponse,
@@ -65,20 +75,56 @@ try:
 except Exception:  # pragma: no cover
     imageio_ffmpeg = None  # type: ignore[assignment]
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
 try:
     import httpx
 except Exception:  # pragma: no cover
     httpx = None  # type: ignore[assignment]
 
 try:
-    from bs4 import BeautifulSoup
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
 except Exception:  # pragma: no cover
     BeautifulSoup = None  # type: ignore[assignment]
+    SoupStrainer = None  # type: ignore[assignment]
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:  # pragma: no cover
+    LexborHTMLParser = None  # type: ignore[assignment]
 
 try:
-    from PIL import Image, ImageFilter
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except Exception:  # pragma: no cover
+    HTML_PARSER = "html.parser"
+
+try:
+    from PIL import Image, ImageChops, ImageFilter
 except Exception:  # pragma: no cover
     Image = None  # type: ignore[assignment]
+    ImageChops = None  # type: ignore[assignment]
     ImageFilter = None  # type: ignore[assignment]
 
 try:
@@ -97,15 +143,31 @@ except Exception:  # pragma: no cover
     CLIPProcessor = None  # type: ignore[assignment]
 
 
+logger = logging.getLogger(__name__)
+
 STEP_SECONDS = 0.05
+PIPELINE_WORKERS = max(1, int(os.getenv("PIPELINE_WORKERS", "8")))
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_STATE_FILE = Path(os.getenv("JOB_STATE_FILE", "./data/job_state.json"))
 DEFAULT_ASSET_ROOT = Path(os.getenv("ASSET_ROOT", "./data/assets"))
+STATE_FLUSH_DELAY_SECONDS = float(os.getenv("STATE_FLUSH_DELAY_SECONDS", "0.1"))
+EMBEDDINGS_FILE_MAGIC = b"OOTDEMB1"
+# Per record: product id length, vector length; then the id (utf-8) and float32 little-endian values.
+EMBEDDINGS_RECORD_HEADER = struct.Struct("<HI")
+# zstd level for the state and catalog files (0 writes plain JSON); both forms are read back.
+STATE_ZSTD_LEVEL = int(os.getenv("STATE_ZSTD_LEVEL", "3"))
+ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+UPLOAD_IMAGE_CACHE_SIZE = int(os.getenv("UPLOAD_IMAGE_CACHE_SIZE", "4"))
+QUERY_FEATURE_CACHE_SIZE = int(os.getenv("QUERY_FEATURE_CACHE_SIZE", "256"))
+ITEM_SIGNATURE_CACHE_SIZE = int(os.getenv("ITEM_SIGNATURE_CACHE_SIZE", "50000"))
 PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "http://localhost:8000").rstrip("/")
 RENDER_SECONDS = float(os.getenv("RENDER_SECONDS", "4"))
+RENDER_X264_PRESET = os.getenv("RENDER_X264_PRESET", "ultrafast")
 ENABLE_REAL_RENDER = os.getenv("ENABLE_REAL_RENDER", "1") == "1"
 YOUTUBE_UPLOAD_REQUIRED = os.getenv("YOUTUBE_UPLOAD_REQUIRED", "0") == "1"
 YOUTUBE_PRIVACY_STATUS = os.getenv("YOUTUBE_PRIVACY_STATUS", "unlisted")
+# Videos up to this size go up as one streamed request; larger ones in chunks of this size.
+YOUTUBE_UPLOAD_CHUNK_SIZE = int(os.getenv("YOUTUBE_UPLOAD_CHUNK_SIZE", str(100 * 1024 * 1024)))
 CATALOG_MIN_IMAGE_SIM = float(os.getenv("CATALOG_MIN_IMAGE_SIM", "0.35"))
 CATALOG_MIN_ITEMS_PER_CATEGORY = int(os.getenv("CATALOG_MIN_ITEMS_PER_CATEGORY", "300"))
 CATALOG_CRAWL_USE_IMAGE_EMBEDDING = os.getenv("CATALOG_CRAWL_USE_IMAGE_EMBEDDING", "1") == "1"
@@ -121,15 +183,43 @@ QDRANT_URL = os.getenv("QDRANT_URL", "http://qdrant:6333")
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "musinsa_catalog")
 QDRANT_TOPK_MULTIPLIER = int(os.getenv("QDRANT_TOPK_MULTIPLIER", "12"))
 QDRANT_TIMEOUT_SECONDS = float(os.getenv("QDRANT_TIMEOUT_SECONDS", "10"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "0") == "1"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "200"))
 QDRANT_UPSERT_WAIT = os.getenv("QDRANT_UPSERT_WAIT", "1") == "1"
+QDRANT_INDEXING_THRESHOLD = int(os.getenv("QDRANT_INDEXING_THRESHOLD", "20000"))
+QDRANT_SCALAR_QUANTIZATION = os.getenv("QDRANT_SCALAR_QUANTIZATION", "1") == "1"
+QDRANT_UPLOAD_PARALLEL = max(1, int(os.getenv("QDRANT_UPLOAD_PARALLEL", str(min(4, os.cpu_count() or 1)))))
+CATALOG_INDEX_WORKERS = max(1, int(os.getenv("CATALOG_INDEX_WORKERS", "8")))
+CATALOG_CRAWL_WORKERS = max(1, int(os.getenv("CATALOG_CRAWL_WORKERS", "5")))
+ROI_EMBED_WORKERS = max(1, int(os.getenv("ROI_EMBED_WORKERS", "4")))
+# Histogram embeddings built from one 96x96 resample (plus JPEG draft decoding). Several times
+# faster, but the features shift slightly, so rebuild the catalog index after switching.
+HIST_EMBED_FUSED_RESAMPLE = os.getenv("HIST_EMBED_FUSED_RESAMPLE", "0") == "1"
+# Storage type of the shared catalog embedding matrix. Opt-in float16 halves its footprint and
+# int8 (unit rows scaled by 127) quarters it at about 1e-2 cosine error; both shift scores and
+# near-tie rankings slightly. Rows are widened to float32 only for the candidates being scored.
+CATALOG_MATRIX_DTYPE = os.getenv("CATALOG_MATRIX_DTYPE", "float32").strip().lower()
+# Below this length the list -> ndarray conversion costs as much as or more than NumPy saves
+# on a dot product or norm; NumPy only pulls clearly ahead from about 128 elements.
+NUMPY_VECTOR_MIN_LEN = 128
 CATEGORY_QUERY_PRIORITY = ["top", "bottom", "outer", "shoes", "bag"]
 DEFAULT_TARGET_GENDER = os.getenv("DEFAULT_TARGET_GENDER", "men")
+# Value -> member map for _coerce_gender, which runs for every catalog item and job on load.
+TARGET_GENDER_BY_VALUE = {gender.value: gender for gender in TargetGender}
 SEMANTIC_EMBEDDING_BACKEND = os.getenv("SEMANTIC_EMBEDDING_BACKEND", "clip").strip().lower()
 CLIP_MODEL_NAME = os.getenv("CLIP_MODEL_NAME", "openai/clip-vit-base-patch16")
 CLIP_DEVICE = os.getenv("CLIP_DEVICE", "auto").strip().lower()
 SIMULATE_RANDOM_FAILURES = os.getenv("SIMULATE_RANDOM_FAILURES", "0") == "1"
-GENDER_MEN_TOKENS = [
+# Candidate score weights over (image, style, color, attr, price); meta uses (style, color, attr).
+FINAL_SCORE_WEIGHTS = (0.54, 0.18, 0.20, 0.06, 0.02)
+FINAL_SCORE_WEIGHTS_CLIP = (0.74, 0.14, 0.08, 0.03, 0.01)
+META_SCORE_WEIGHTS = (0.58, 0.22, 0.20)
+PRICE_PATTERN = re.compile(r"[0-9][0-9,]{3,}")
+# Per-band lookup table marking near-white (>245) background values in catalog cutouts.
+NEAR_WHITE_LUT = [255 if value > 245 else 0 for value in range(256)]
+RERANK_EVIDENCE_TAGS = ("rerank:style-signature", "rerank:color-compat", "rerank:attr-compat")
+GENDER_MEN_TOKENS = (
     "남성",
     "남자",
     "맨즈",
@@ -138,8 +228,8 @@ GENDER_MEN_TOKENS = [
     "male",
     "boy",
     "for men",
-]
-GENDER_WOMEN_TOKENS = [
+)
+GENDER_WOMEN_TOKENS = (
     "여성",
     "여자",
     "우먼",
@@ -151,9 +241,9 @@ GENDER_WOMEN_TOKENS = [
     "girl",
     "lady",
     "for women",
-]
-GENDER_UNISEX_TOKENS = ["공용", "남녀", "유니섹스", "unisex"]
-PATTERN_TOKENS = [
+)
+GENDER_UNISEX_TOKENS = ("공용", "남녀", "유니섹스", "unisex")
+PATTERN_TOKENS = (
     "leopard",
     "호피",
     "paisley",
@@ -165,8 +255,8 @@ PATTERN_TOKENS = [
     "dot",
     "lace",
     "레이스",
-]
-DETAIL_TOKENS = [
+)
+DETAIL_TOKENS = (
     "henley",
     "헨리넥",
     "raglan",
@@ -175,10 +265,62 @@ DETAIL_TOKENS = [
     "브이넥",
     "crop",
     "크롭",
-]
-
-
-@dataclass
+)
+# Item-name cues for the top/bottom attribute and target-gender reranks.
+TOP_UNDERWEAR_TOKENS = ("bra", "뷔스티에", "cami", "캐미", "camisole")
+MEN_TOP_FEMININE_TOKENS = ("crop", "크롭", "bra", "브라", "bustier", "뷔스티에", "cami", "camisole", "레이스", "lace")
+MEN_TOP_NECKLINE_TOKENS = ("v-neck", "브이넥", "헨리넥", "henley")
+MEN_BOTTOM_FEMININE_TOKENS = ("leopard", "호피", "floral", "flower", "플라워", "스커트", "skirt")
+WOMEN_TOP_WORKWEAR_TOKENS = ("oversized workwear", "work jacket")
+COLOR_PALETTE = {
+    "black": [0.08, 0.08, 0.08],
+    "white": [0.92, 0.92, 0.92],
+    "gray": [0.50, 0.50, 0.50],
+    "navy": [0.10, 0.14, 0.35],
+    "blue": [0.18, 0.30, 0.72],
+    "brown": [0.42, 0.28, 0.20],
+    "beige": [0.78, 0.70, 0.56],
+    "khaki": [0.58, 0.56, 0.36],
+    "green": [0.22, 0.44, 0.28],
+    "red": [0.68, 0.18, 0.18],
+}
+COLOR_ALIASES = {
+    "블랙": "black",
+    "black": "black",
+    "오프화이트": "white",
+    "white": "white",
+    "화이트": "white",
+    "그레이": "gray",
+    "gray": "gray",
+    "grey": "gray",
+    "네이비": "navy",
+    "navy": "navy",
+    "블루": "blue",
+    "blue": "blue",
+    "브라운": "brown",
+    "brown": "brown",
+    "베이지": "beige",
+    "beige": "beige",
+    "카키": "khaki",
+    "khaki": "khaki",
+    "그린": "green",
+    "green": "green",
+    "레드": "red",
+    "red": "red",
+}
+COLOR_NEIGHBORHOOD = {
+    "navy": {"blue"},
+    "blue": {"navy"},
+    "brown": {"beige", "khaki"},
+    "beige": {"brown", "khaki"},
+    "khaki": {"brown", "beige"},
+    "black": {"gray"},
+    "gray": {"black", "white"},
+    "white": {"gray"},
+}
+
+
+@dataclass(slots=True)
 class JobRecord:
     job_id: UUID
     status: JobStatus
@@ -203,9 +345,13 @@ class JobRecord:
     youtube_url: Optional[str] = None
     youtube_upload_status: YouTubeUploadStatus = YouTubeUploadStatus.PENDING
     roi_debug: dict[str, RoiRegion] = field(default_factory=dict)
+    error_message: Optional[str] = None
+    # Serialized form reused by state writes while the job is unchanged; cleared by
+    # JobService._persist_job_locked, which every job mutation must go through.
+    state_payload: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogItemRecord:
     product_id: str
     category: str
@@ -215,15 +361,22 @@ class CatalogItemRecord:
     image_url: str
     price: Optional[int]
     gender: TargetGender = TargetGender.unisex
-    embedding: list[float] = field(default_factory=list)
+    embedding: array.array = field(default_factory=lambda: array.array("f"))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # Memo for _effective_item_gender; records are replaced, never edited, so it cannot go stale.
+    inferred_gender: Optional[TargetGender] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Embeddings are kept as contiguous float32 rather than lists of Python floats.
+        if not isinstance(self.embedding, array.array):
+            self.embedding = array.array("f", self.embedding)
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlJobRecord:
     crawl_job_id: UUID
     status: CrawlJobStatus
-    mode: CrawlMode
+    mode: CrawlMode = CrawlMode.incremental
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     total_discovered: int = 0
@@ -231,6 +384,25 @@ class CrawlJobRecord:
     error_message: Optional[str] = None
 
 
+# Job and crawl records persist through pydantic-core in both directions; catalog items
+# stay hand-written because their embeddings live in the binary sidecar.
+JOB_RECORD_ADAPTER: TypeAdapter[JobRecord] = TypeAdapter(JobRecord)
+CRAWL_JOB_RECORD_ADAPTER: TypeAdapter[CrawlJobRecord] = TypeAdapter(CrawlJobRecord)
+CRAWL_JOB_RECORD_LIST_ADAPTER: TypeAdapter[list[CrawlJobRecord]] = TypeAdapter(list[CrawlJobRecord])
+
+
+@dataclass(slots=True)
+class CatalogEmbeddingIndex:
+    # Catalog embeddings of one dimension stacked into an L2-normalized matrix (CATALOG_MATRIX_DTYPE).
+    # `embeddings` keeps the source arrays so callers can tell a row is still current.
+    version: int
+    rows: dict[str, int]
+    embeddings: list[array.array]
+    matrix: "np.ndarray"
+    # Multiplier that maps stored values back to unit-norm rows (1/127 for int8).
+    scale: float = 1.0
+
+
 class JobService:
     def __init__(
         self,
@@ -243,8 +415,27 @@ class JobService:
         self._crawl_jobs: dict[UUID, CrawlJobRecord] = {}
         self._idempotency_map: dict[str, UUID] = {}
         self._lock = threading.Lock()
+        # State writes are coalesced: _persist_locked only marks the state dirty and
+        # a single flusher thread writes the latest snapshot shortly afterwards.
+        self._state_dirty = False
+        self._state_dirty_event = threading.Event()
+        self._state_write_lock = threading.Lock()
+        self._state_digest: bytes | None = None
+        self._qdrant_sync_lock = threading.Lock()
+        # (vector digest, payload digest) per product as last pushed to Qdrant; guarded by _qdrant_sync_lock.
+        self._qdrant_point_digests: dict[str, tuple[bytes, bytes]] = {}
         self._booted_at = time.time()
         self._state_file = (state_file or DEFAULT_STATE_FILE).resolve()
+        # Catalog embeddings live in a binary sidecar that is rewritten only when the catalog changes.
+        self._embeddings_file = self._state_file.with_name(f"{self._state_file.name}.embeddings")
+        # Catalog metadata has its own file as well, so job mutations only rewrite the small state file.
+        self._catalog_file = self._state_file.with_name(f"{self._state_file.name}.catalog")
+        self._catalog_dirty = False
+        # Bumped on every catalog change; the embedding matrix is rebuilt lazily when it lags.
+        self._catalog_version = 0
+        self._embedding_index: Optional[CatalogEmbeddingIndex] = None
+        self._embedding_index_lock = threading.Lock()
+        self._fallback_pool: Optional[dict[str, list[CatalogItemRecord]]] = None
         self._asset_root = (asset_root or DEFAULT_ASSET_ROOT).resolve()
         self._uploads_dir = self._asset_root / "uploads"
         self._previews_dir = self._asset_root / "previews"
@@ -254,20 +445,66 @@ class JobService:
         self._enable_real_render = enable_real_render
         self._last_incremental_at: Optional[datetime] = None
         self._last_full_reindex_at: Optional[datetime] = None
-        self._item_style_signature_cache: dict[str, tuple[list[float], float, float]] = {}
+        # LRU with its own lock; product ids from old incremental crawls would otherwise pile up.
+        self._item_style_signature_cache: OrderedDict[str, tuple[list[float], float, float]] = OrderedDict()
+        self._item_style_signature_lock = threading.Lock()
         self._item_semantic_embedding_cache: dict[str, list[float]] = {}
+        # Decoded uploads keyed by (path, mtime_ns); ROI vectors and style signatures share one decode.
+        self._upload_image_cache: OrderedDict[tuple[str, int], "Image.Image"] = OrderedDict()
+        self._upload_image_lock = threading.Lock()
+        # ROI query vectors and style signatures keyed by upload content hash, so reranks
+        # and retries of the same photo skip image processing entirely.
+        self._query_feature_cache: OrderedDict[
+            str, tuple[dict[str, list[float]], dict[str, RoiRegion], dict[str, tuple[list[float], float, float]]]
+        ] = OrderedDict()
         self._semantic_backend = SEMANTIC_EMBEDDING_BACKEND
         self._semantic_model = None
         self._semantic_processor = None
         self._semantic_device = "cpu"
         self._semantic_model_ready = False
         self._semantic_lock = threading.Lock()
+        # Shared by all jobs: the ROI crops of one upload are embedded concurrently.
+        self._roi_executor = ThreadPoolExecutor(max_workers=ROI_EMBED_WORKERS, thread_name_prefix="roi-embed")
+        # Pooled client for catalog image downloads, created on first use and shared by
+        # crawls and index rebuilds so connections (and TLS sessions) are reused.
+        self._image_http_client: Optional["httpx.Client"] = None
+        self._image_http_client_lock = threading.Lock()
         self._qdrant_client = self._init_qdrant_client()
         self._uploads_dir.mkdir(parents=True, exist_ok=True)
         self._previews_dir.mkdir(parents=True, exist_ok=True)
         self._videos_dir.mkdir(parents=True, exist_ok=True)
         self._catalog_cache_dir.mkdir(parents=True, exist_ok=True)
         self._load_state()
+        self._closing = False
+        self._flush_thread = threading.Thread(target=self._state_flush_loop, daemon=True)
+        self._flush_thread.start()
+        # Jobs run on a fixed set of worker threads instead of one new thread per job;
+        # a None entry tells one worker to exit.
+        self._pipeline_queue: queue.SimpleQueue[Optional[UUID]] = queue.SimpleQueue()
+        self._pipeline_threads = [
+            threading.Thread(target=self._pipeline_worker, daemon=True) for _ in range(PIPELINE_WORKERS)
+        ]
+        for thread in self._pipeline_threads:
+            thread.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Finish queued jobs, stop the service's threads and write the final state."""
+        if self._closing:
+            return
+        for _ in self._pipeline_threads:
+            self._pipeline_queue.put(None)
+        for thread in self._pipeline_threads:
+            thread.join()
+        with self._lock:
+            # Under the lock so flush() cannot clear the wake-up between these two lines.
+            self._closing = True
+            self._state_dirty_event.set()
+        self._flush_thread.join()
+        self._roi_executor.shutdown(wait=True)
+        self.flush()
+        self._close_image_http_client()
+        atexit.unregister(self.close)
 
     @property
     def asset_root(self) -> Path:
@@ -291,8 +528,17 @@ class JobService:
                 existing = self._jobs[self._idempotency_map[idempotency_key]]
                 return CreateJobResponse(job_id=existing.job_id, status=existing.status, estimated_seconds=2)
 
-            job_id = uuid4()
-            upload_path = self._save_upload(job_id, image_bytes, image_content_type)
+        # Write the upload before taking the lock so status polling is not blocked on disk.
+        job_id = uuid4()
+        upload_path = self._save_upload(job_id, image_bytes, image_content_type)
+        with self._lock:
+            if idempotency_key and idempotency_key in self._idempotency_map:
+                # A concurrent request with the same key won the race; drop both files this one saved.
+                upload_path.unlink(missing_ok=True)
+                (self._previews_dir / f"{job_id}.jpg").unlink(missing_ok=True)
+                existing = self._jobs[self._idempotency_map[idempotency_key]]
+                return CreateJobResponse(job_id=existing.job_id, status=existing.status, estimated_seconds=2)
+
             record = JobRecord(
                 job_id=job_id,
                 status=JobStatus.INGESTED,
@@ -313,8 +559,7 @@ class JobService:
                 self._idempotency_map[idempotency_key] = job_id
             self._persist_locked()
 
-        t = threading.Thread(target=self._run_pipeline, args=(job_id,), daemon=True)
-        t.start()
+        self._pipeline_queue.put(job_id)
 
         return CreateJobResponse(job_id=job_id, status=record.status, estimated_seconds=2)
 
@@ -358,7 +603,7 @@ class JobService:
                     break
             if not replaced:
                 record.items.append(selected)
-            self._persist_locked()
+            self._persist_job_locked(record)
 
         return RerankResponse(job_id=job_id, category=req.category, candidates=candidates, selected=selected)
 
@@ -373,10 +618,11 @@ class JobService:
             record.status = JobStatus.COMPLETED
             record.progress = 100
             record.completed_at = datetime.now(timezone.utc)
-            self._persist_locked()
+            self._persist_job_locked(record)
 
             video_url = record.video_url
 
+        self.flush()
         self._attempt_youtube_upload(job_id)
         with self._lock:
             latest = self._jobs[job_id]
@@ -394,6 +640,7 @@ class JobService:
                 raise HTTPException(status_code=409, detail="rendered video not available")
 
         self._attempt_youtube_upload(job_id)
+        self.flush()
         with self._lock:
             latest = self._jobs[job_id]
             if latest.youtube_upload_status != YouTubeUploadStatus.UPLOADED or not latest.youtube_url:
@@ -439,39 +686,51 @@ class JobService:
         indexed = 0
         if httpx is None:
             return CatalogIndexRebuildResponse(total_products=len(items), total_indexed_products=0)
-        with httpx.Client(timeout=6.0, headers={"User-Agent": "Mozilla/5.0"}) as client:
-            for item in items:
-                # In clip mode, avoid recomputing vectors that are already clip-sized.
-                if self._semantic_backend == "clip" and len(item.embedding) >= 512:
-                    embedding = item.embedding
-                else:
-                    embedding = self._embedding_from_url(item.image_url, client=client)
-                if embedding:
-                    with self._lock:
-                        existing = self._catalog.get(item.product_id)
-                        if existing:
-                            existing.embedding = embedding
-                            existing.updated_at = datetime.now(timezone.utc)
-                    indexed += 1
+
+        def item_embedding(item: CatalogItemRecord) -> list[float]:
+            # In clip mode, avoid recomputing vectors that are already clip-sized.
+            if self._semantic_backend == "clip" and len(item.embedding) >= 512:
+                return item.embedding
+            return self._embedding_from_url(item.image_url)
+
+        # Image downloads dominate a rebuild; fetch and embed several items at once.
+        with ThreadPoolExecutor(max_workers=CATALOG_INDEX_WORKERS) as pool:
+            embeddings = list(pool.map(item_embedding, items))
+
+        for item, embedding in zip(items, embeddings):
+            if embedding:
+                with self._lock:
+                    existing = self._catalog.get(item.product_id)
+                    if existing:
+                        existing.embedding = array.array("f", embedding)
+                        existing.updated_at = datetime.now(timezone.utc)
+                indexed += 1
 
         with self._lock:
             snapshot = list(self._catalog.values())
-            self._sync_qdrant(snapshot, mode=CrawlMode.full)
+        self._sync_qdrant(snapshot, mode=CrawlMode.full)
+        with self._lock:
             self._last_full_reindex_at = datetime.now(timezone.utc)
-            self._persist_locked()
+            self._persist_catalog_locked()
             return CatalogIndexRebuildResponse(total_products=len(self._catalog), total_indexed_products=indexed)
 
     def catalog_stats(self) -> CatalogStatsResponse:
         with self._lock:
-            categories = Counter([item.category for item in self._catalog.values()])
-            indexed_categories = Counter([item.category for item in self._catalog.values() if item.embedding])
-            completed = [j.completed_at for j in self._crawl_jobs.values() if j.status == CrawlJobStatus.COMPLETED and j.completed_at]
-            indexed = sum(1 for item in self._catalog.values() if item.embedding)
+            categories: Counter[str] = Counter()
+            indexed_categories: Counter[str] = Counter()
+            for item in self._catalog.values():
+                categories[item.category] += 1
+                if item.embedding:
+                    indexed_categories[item.category] += 1
+            last_completed = max(
+                (j.completed_at for j in self._crawl_jobs.values() if j.status == CrawlJobStatus.COMPLETED and j.completed_at),
+                default=None,
+            )
             return CatalogStatsResponse(
                 total_products=len(self._catalog),
-                total_indexed_products=indexed,
+                total_indexed_products=indexed_categories.total(),
                 categories=dict(categories),
-                last_crawl_completed_at=max(completed) if completed else None,
+                last_crawl_completed_at=last_completed,
                 per_category_indexed=dict(indexed_categories),
                 last_incremental_at=self._last_incremental_at,
                 last_full_reindex_at=self._last_full_reindex_at,
@@ -533,19 +792,24 @@ class JobService:
         return HealthResponse(status="ok", uptime_seconds=int(time.time() - self._booted_at), total_jobs=total_jobs)
 
     def metrics(self) -> MetricsResponse:
+        total_completed = total_failed = total_retried = total_youtube_uploaded = 0
+        duration_sum = 0.0
+        duration_count = 0
         with self._lock:
-            records = list(self._jobs.values())
-        total_created = len(records)
-        total_completed = sum(1 for r in records if r.status == JobStatus.COMPLETED)
-        total_failed = sum(1 for r in records if r.status == JobStatus.FAILED)
-        total_retried = sum(1 for r in records if r.parent_job_id is not None)
-        total_youtube_uploaded = sum(1 for r in records if r.youtube_upload_status == YouTubeUploadStatus.UPLOADED)
-        durations = [
-            (r.completed_at - r.created_at).total_seconds()
-            for r in records
-            if r.completed_at is not None and r.completed_at >= r.created_at
-        ]
-        avg_processing = sum(durations) / len(durations) if durations else 0.0
+            total_created = len(self._jobs)
+            for r in self._jobs.values():
+                if r.status == JobStatus.COMPLETED:
+                    total_completed += 1
+                elif r.status == JobStatus.FAILED:
+                    total_failed += 1
+                if r.parent_job_id is not None:
+                    total_retried += 1
+                if r.youtube_upload_status == YouTubeUploadStatus.UPLOADED:
+                    total_youtube_uploaded += 1
+                if r.completed_at is not None and r.completed_at >= r.created_at:
+                    duration_sum += (r.completed_at - r.created_at).total_seconds()
+                    duration_count += 1
+        avg_processing = duration_sum / duration_count if duration_count else 0.0
         return MetricsResponse(
             total_jobs_created=total_created,
             total_jobs_completed=total_completed,
@@ -582,6 +846,32 @@ class JobService:
             roi_debug=r.roi_debug,
         )
 
+    def _pipeline_worker(self) -> None:
+        while True:
+            job_id = self._pipeline_queue.get()
+            if job_id is None:
+                return
+            try:
+                self._run_pipeline(job_id)
+            except Exception as exc:
+                logger.exception("pipeline failed for job %s", job_id)
+                self._fail_job(job_id, f"{type(exc).__name__}: {exc}")
+
+    def _fail_job(self, job_id: UUID, error_message: str) -> None:
+        # A pipeline step raised unexpectedly; end the job as failed (and retryable) instead of
+        # leaving it mid-flight.
+        with self._lock:
+            rec = self._jobs.get(job_id)
+            if not rec or rec.status in {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.REVIEW_REQUIRED}:
+                return
+            rec.status = JobStatus.FAILED
+            rec.error_message = error_message
+            rec.progress = 100
+            rec.completed_at = datetime.now(timezone.utc)
+            rec.failure_code = rec.failure_code or FailureCode.RENDER_ERROR
+            rec.youtube_upload_status = YouTubeUploadStatus.SKIPPED
+            self._persist_job_locked(rec)
+
     def _run_pipeline(self, job_id: UUID) -> None:
         time.sleep(STEP_SECONDS)
         with self._lock:
@@ -590,7 +880,7 @@ class JobService:
                 return
             rec.status = JobStatus.ANALYZED
             rec.progress = 20
-            self._persist_locked()
+            self._persist_job_locked(rec)
 
         time.sleep(STEP_SECONDS)
         with self._lock:
@@ -622,7 +912,7 @@ class JobService:
             rec.items = matched_items
             rec.roi_debug = roi_debug
             rec.preview_url = f"{PUBLIC_BASE_URL}/assets/previews/{job_id}.jpg"
-            self._persist_locked()
+            self._persist_job_locked(rec)
 
         time.sleep(STEP_SECONDS)
         with self._lock:
@@ -631,7 +921,7 @@ class JobService:
                 return
             rec.status = JobStatus.COMPOSED
             rec.progress = 70
-            self._persist_locked()
+            self._persist_job_locked(rec)
 
         time.sleep(STEP_SECONDS)
         with self._lock:
@@ -640,7 +930,7 @@ class JobService:
                 return
             rec.status = JobStatus.RENDERING
             rec.progress = 85
-            self._persist_locked()
+            self._persist_job_locked(rec)
 
         # render video outside lock
         try:
@@ -655,7 +945,7 @@ class JobService:
                 rec.completed_at = datetime.now(timezone.utc)
                 rec.failure_code = FailureCode.RENDER_ERROR
                 rec.youtube_upload_status = YouTubeUploadStatus.FAILED
-                self._persist_locked()
+                self._persist_job_locked(rec)
             return
 
         with self._lock:
@@ -668,7 +958,7 @@ class JobService:
                 rec.status = JobStatus.REVIEW_REQUIRED
                 rec.progress = 95
                 rec.completed_at = datetime.now(timezone.utc)
-                self._persist_locked()
+                self._persist_job_locked(rec)
                 return
 
             if rec.had_partial_match and SIMULATE_RANDOM_FAILURES and random.random() < 0.5:
@@ -679,7 +969,7 @@ class JobService:
                 if rec.items and all(item.failure_code is None for item in rec.items):
                     rec.items[-1].failure_code = FailureCode.CRAWL_TIMEOUT
                 rec.youtube_upload_status = YouTubeUploadStatus.SKIPPED
-                self._persist_locked()
+                self._persist_job_locked(rec)
                 return
 
             if SIMULATE_RANDOM_FAILURES and random.random() < 0.05:
@@ -688,13 +978,13 @@ class JobService:
                 rec.completed_at = datetime.now(timezone.utc)
                 rec.failure_code = FailureCode.RENDER_ERROR
                 rec.youtube_upload_status = YouTubeUploadStatus.FAILED
-                self._persist_locked()
+                self._persist_job_locked(rec)
                 return
 
             rec.status = JobStatus.COMPLETED
             rec.progress = 100
             rec.completed_at = datetime.now(timezone.utc)
-            self._persist_locked()
+            self._persist_job_locked(rec)
 
         self._attempt_youtube_upload(job_id, rendered_path)
 
@@ -716,7 +1006,7 @@ class JobService:
                 if rec:
                     rec.youtube_upload_status = YouTubeUploadStatus.FAILED
                     rec.failure_code = rec.failure_code or FailureCode.RENDER_ERROR
-                    self._persist_locked()
+                    self._persist_job_locked(rec)
             return
 
         if not self._youtube_configured():
@@ -724,7 +1014,7 @@ class JobService:
                 rec = self._jobs.get(job_id)
                 if rec:
                     rec.youtube_upload_status = YouTubeUploadStatus.SKIPPED
-                    self._persist_locked()
+                    self._persist_job_locked(rec)
             return
 
         try:
@@ -737,7 +1027,7 @@ class JobService:
                 rec.youtube_video_id = video_id
                 rec.youtube_url = youtube_url
                 rec.youtube_upload_status = YouTubeUploadStatus.UPLOADED
-                self._persist_locked()
+                self._persist_job_locked(rec)
         except Exception:
             with self._lock:
                 rec = self._jobs.get(job_id)
@@ -747,7 +1037,7 @@ class JobService:
                 if YOUTUBE_UPLOAD_REQUIRED and rec.status != JobStatus.REVIEW_REQUIRED:
                     rec.status = JobStatus.FAILED
                     rec.failure_code = FailureCode.LICENSE_BLOCKED
-                self._persist_locked()
+                self._persist_job_locked(rec)
 
     def _build_match_items(self, record: JobRecord, look_count: int) -> list[MatchItem]:
         items, _ = self._search_catalog(
@@ -781,14 +1071,8 @@ class JobService:
             price_cap=normalized_price_cap,
             color_hint=color_hint,
             target_gender=record.target_gender,
+            color_in_name=True,
         )
-        color_text = (color_hint or "").strip().title()
-        if color_text:
-            for item in results:
-                if item.product_name and color_text not in item.product_name:
-                    item.product_name = f"{category.title()} {color_text} {item.product_name}"
-                if item.evidence_tags is not None:
-                    item.evidence_tags.append(f"color:{color_hint.strip().lower()}")
         return results
 
     def _search_catalog(
@@ -799,25 +1083,34 @@ class JobService:
         price_cap: Optional[int],
         color_hint: Optional[str],
         target_gender: TargetGender,
+        color_in_name: bool = False,
     ) -> tuple[list[MatchItem], dict[str, RoiRegion]]:
         effective_look_count = self._effective_auto_match_count(look_count, category)
-        query_vectors, roi_debug = self._query_vectors_by_category(upload_image_path)
+        query_vectors, roi_debug, query_style = self._query_features(upload_image_path)
         semantic_query_vectors = self._query_semantic_vectors_by_category(upload_image_path)
-        query_style = self._query_style_signatures_by_category(upload_image_path)
         global_query_vector = query_vectors.get("global", [])
         clip_primary_active = self._semantic_backend == "clip" and len(global_query_vector) >= 512
         query_dim = len(global_query_vector)
         if not global_query_vector:
             return [], roi_debug
+        # Blend each category query once; retrieval and rescoring both reuse them.
+        composed_queries = {
+            cat: self._compose_query_vector(cat, query_vectors) for cat in {*CATEGORY_QUERY_PRIORITY, *query_vectors}
+        }
 
         with self._lock:
             catalog_items = list(self._catalog.values())
 
         if not catalog_items:
-            catalog_items = self._fallback_catalog_items()
+            catalog_items = [item for items in self._fallback_items_by_category().values() for item in items]
 
         color_hint_text = (color_hint or "").strip().lower()
-        candidates: list[tuple[float, CatalogItemRecord, ScoreBreakdown, list[str]]] = []
+        # Off-category items are dropped below, so the category score is fixed per search.
+        category_score = 1.0 if category else 0.8
+        # Per-row inputs are gathered first so final/meta scores are combined in one pass.
+        passing: list[tuple[CatalogItemRecord, TargetGender, float, float]] = []
+        scored: list[tuple[CatalogItemRecord, TargetGender, float]] = []
+        subscores: list[tuple[float, float, float, float, float, float]] = []
         required_categories = self._required_categories_for_auto_match(effective_look_count, category)
         candidate_items = self._qdrant_search_candidates(
             query_vectors=query_vectors,
@@ -825,11 +1118,22 @@ class JobService:
             category=category,
             preferred_categories=required_categories or CATEGORY_QUERY_PRIORITY,
             limit=max(30, effective_look_count * QDRANT_TOPK_MULTIPLIER),
+            target_gender=target_gender,
+            price_cap=price_cap,
+            composed_queries=composed_queries,
         )
+        # Cheap record checks first; only survivors get a cosine and the heavier scoring.
+        eligible: list[tuple[CatalogItemRecord, TargetGender]] = []
         for item in candidate_items:
-            effective_item_gender = self._effective_item_gender(item)
             if category and item.category != category:
                 continue
+            if not item.embedding:
+                continue
+            if clip_primary_active and len(item.embedding) != query_dim:
+                continue
+            if price_cap is not None and item.price is not None and item.price > price_cap:
+                continue
+            effective_item_gender = self._effective_item_gender(item)
             if not self._is_gender_compatible(target_gender, effective_item_gender):
                 continue
             if (
@@ -838,16 +1142,9 @@ class JobService:
                 and self._has_opposite_gender_cue(target_gender, f"{item.brand} {item.product_name} {item.product_url}")
             ):
                 continue
-            if price_cap is not None and item.price is not None and item.price > price_cap:
-                continue
-            if not item.embedding:
-                continue
-            if clip_primary_active and len(item.embedding) != query_dim:
-                continue
-            item_query = self._compose_query_vector(item.category, query_vectors)
-            if not item_query:
-                item_query = global_query_vector
-            image_sim_raw = self._cosine_similarity_signed(item_query, item.embedding)
+            eligible.append((item, effective_item_gender))
+        image_sims = self._image_similarities([item for item, _ in eligible], query_vectors, composed_queries)
+        for (item, effective_item_gender), image_sim_raw in zip(eligible, image_sims):
             image_sim = ((image_sim_raw + 1.0) / 2.0) if clip_primary_active else max(0.0, image_sim_raw)
             semantic_sim = self._semantic_similarity(item=item, category=item.category, query_vectors=semantic_query_vectors)
             if clip_primary_active:
@@ -863,20 +1160,48 @@ class JobService:
             )
             if blended_image_sim < min_image_sim:
                 continue
-            text_score = 0.0
-            category_score = 1.0 if category and item.category == category else 0.8
-            price_score = self._price_fit_score(item.price, price_cap)
+            passing.append((item, effective_item_gender, semantic_sim, blended_image_sim))
+
+        price_scores = [self._price_fit_score(item.price, price_cap) for item, _, _, _ in passing]
+
+        # Style, color, attr and penalty scoring runs in order of each row's best possible final
+        # score (style = color = attr = penalty = 1). A row whose ceiling is below the current
+        # K-th best final, and below the best of its category when that category is required,
+        # can never be selected and is dropped unscored, before its style signature is even
+        # loaded. Rows keep their arrival order for tie-breaking.
+        final_weights = FINAL_SCORE_WEIGHTS_CLIP if clip_primary_active else FINAL_SCORE_WEIGHTS
+        required_set = set(required_categories)
+        outer_ceilings = [
+            final_weights[0] * row[3] + final_weights[1] + final_weights[2] + final_weights[3] + final_weights[4] * price
+            for row, price in zip(passing, price_scores)
+        ]
+        style_scores = [0.0] * len(passing)
+        top_finals: list[float] = []
+        best_required: dict[str, float] = {}
+        kept: list[Optional[tuple[float, float, float]]] = [None] * len(passing)
+        for idx in sorted(range(len(passing)), key=outer_ceilings.__getitem__, reverse=True):
+            item = passing[idx][0]
+            bar = top_finals[0] if len(top_finals) >= effective_look_count else -math.inf
+            if item.category in required_set:
+                bar = min(bar, best_required.get(item.category, -math.inf))
+            if outer_ceilings[idx] < bar - 1e-9:
+                continue
             item_sig = self._item_style_signature(item)
             style_score = self._style_similarity_score(query_style.get(item.category), item_sig)
+            style_scores[idx] = style_score
+            ceiling = outer_ceilings[idx] - final_weights[1] * (1.0 - style_score)
+            if ceiling < bar - 1e-9:
+                continue
+            item_text = f"{item.brand} {item.product_name}"
             query_sig = query_style.get(item.category) or query_style.get("global")
             color_score = self._color_similarity_score(
                 query_rgb=(query_sig[0] if query_sig else [0.0, 0.0, 0.0]),
-                item_name=f"{item.brand} {item.product_name}",
+                item_name=item_text,
                 item_rgb=item_sig[0],
             )
             attr_score = self._attribute_compatibility_score(
                 query_sig=query_sig,
-                item_name=f"{item.brand} {item.product_name}",
+                item_name=item_text,
                 category=item.category,
             )
             if attr_score < 0.25:
@@ -884,33 +1209,58 @@ class JobService:
             style_penalty = self._target_gender_style_penalty(
                 target_gender=target_gender,
                 category=item.category,
-                item_name=f"{item.brand} {item.product_name}",
+                item_name=item_text,
             )
-            meta_score = (0.58 * style_score) + (0.22 * color_score) + (0.20 * attr_score)
-            if clip_primary_active:
-                final = (
-                    (0.74 * blended_image_sim)
-                    + (0.14 * style_score)
-                    + (0.08 * color_score)
-                    + (0.03 * attr_score)
-                    + (0.01 * price_score)
-                ) * style_penalty
-            else:
-                final = (
-                    (0.54 * blended_image_sim)
-                    + (0.18 * style_score)
-                    + (0.20 * color_score)
-                    + (0.06 * attr_score)
-                    + (0.02 * price_score)
-                ) * style_penalty
+            kept[idx] = (color_score, attr_score, style_penalty)
+            final = (ceiling - final_weights[2] * (1.0 - color_score) - final_weights[3] * (1.0 - attr_score)) * style_penalty
+            if len(top_finals) < effective_look_count:
+                heapq.heappush(top_finals, final)
+            elif final > top_finals[0]:
+                heapq.heapreplace(top_finals, final)
+            if item.category in required_set:
+                best_required[item.category] = max(best_required.get(item.category, -math.inf), final)
+        for (item, effective_item_gender, semantic_sim, blended_image_sim), style_score, price_score, row_scores in zip(
+            passing, style_scores, price_scores, kept
+        ):
+            if row_scores is None:
+                continue
+            color_score, attr_score, style_penalty = row_scores
+            scored.append((item, effective_item_gender, semantic_sim))
+            subscores.append((blended_image_sim, style_score, color_score, attr_score, price_score, style_penalty))
+
+        final_scores, meta_scores = self._combine_scores(subscores, clip_primary_active)
+        # Rank on (final, item, row) only; breakdowns and tags are built for the shown rows.
+        candidates: list[tuple[float, CatalogItemRecord, int]] = [
+            (final, entry[0], row)
+            for row, (entry, final) in enumerate(zip(scored, final_scores))
+        ]
+
+        # Both paths rank like a stable descending sort without sorting rows that are never shown.
+        if required_categories:
+            top = self._select_balanced_candidates(candidates, effective_look_count, required_categories)
+        else:
+            top = heapq.nlargest(effective_look_count, candidates, key=lambda row: row[0])
+        base_tags = (
+            f"model:{'clip-embed' if clip_primary_active else 'hist-embed'}",
+            *RERANK_EVIDENCE_TAGS,
+            f"target_gender:{target_gender.value}",
+        )
+        index_tag = f"index:{'qdrant' if self._qdrant_client else 'memory'}"
+        # Reranks with a color hint show it in the product name, e.g. "Top Black <name>".
+        color_title = color_hint_text.title() if color_in_name else ""
+        results: list[MatchItem] = []
+        for idx, (final, item, row) in enumerate(top):
+            _, effective_item_gender, semantic_sim = scored[row]
+            blended_image_sim, _, _, _, price_score, style_penalty = subscores[row]
             score = ScoreBreakdown(
                 image=round(blended_image_sim, 4),
-                text=round(text_score, 4),
+                text=0.0,
                 category=round(category_score, 4),
                 price=round(price_score, 4),
                 final=round(final, 4),
-                meta=round(meta_score, 4),
+                meta=round(meta_scores[row], 4),
                 roi_confidence=round(roi_debug.get(item.category, RoiRegion(category=item.category)).confidence, 4),
+                retrieval_rank=idx + 1,
             )
             query_region = item.category if item.category in query_vectors else "global"
             tags = [
@@ -918,13 +1268,9 @@ class JobService:
                 f"query_region:{query_region}",
                 f"category:{item.category}",
                 "source:crawled",
-                f"model:{'clip-embed' if clip_primary_active else 'hist-embed'}",
-                "rerank:style-signature",
-                "rerank:color-compat",
-                "rerank:attr-compat",
-                f"target_gender:{target_gender.value}",
+                *base_tags,
                 f"item_gender:{effective_item_gender.value}",
-                f"index:{'qdrant' if self._qdrant_client else 'memory'}",
+                index_tag,
             ]
             if price_cap is not None:
                 tags.append(f"price_cap:{price_cap}")
@@ -934,22 +1280,15 @@ class JobService:
                 tags.append("rerank:target-style-penalty")
             if semantic_sim > 0:
                 tags.append(f"rerank:semantic-{self._semantic_backend}")
-            candidates.append((final, item, score, tags))
-
-        candidates.sort(key=lambda row: row[0], reverse=True)
-        if required_categories:
-            top = self._select_balanced_candidates(candidates, effective_look_count, required_categories)
-        else:
-            top = candidates[:effective_look_count]
-        results: list[MatchItem] = []
-        for idx, (_, item, score, tags) in enumerate(top):
-            score.retrieval_rank = idx + 1
+            product_name = item.product_name
+            if color_title and product_name and color_title not in product_name:
+                product_name = " ".join((item.category.title(), color_title, product_name))
             results.append(
                 MatchItem(
                     category=item.category,
                     product_id=item.product_id,
                     brand=item.brand,
-                    product_name=item.product_name,
+                    product_name=product_name,
                     price=item.price,
                     product_url=item.product_url,
                     image_url=item.image_url,
@@ -968,16 +1307,16 @@ class JobService:
             needed = effective_look_count - len(results)
             existing_product_ids = {item.product_id for item in results if item.product_id}
             existing_categories = {item.category for item in results if item.category}
-            fallback = self._fallback_catalog_items()
+            fallback_by_category = self._fallback_items_by_category()
+            fallback = [item for items in fallback_by_category.values() for item in items]
             for required_category in missing_required_categories:
                 if required_category in existing_categories:
                     continue
                 fallback_item = next(
                     (
                         item
-                        for item in fallback
-                        if item.category == required_category
-                        and item.product_id not in existing_product_ids
+                        for item in fallback_by_category.get(required_category, ())
+                        if item.product_id not in existing_product_ids
                         and self._is_gender_compatible(target_gender, self._effective_item_gender(item))
                     ),
                     None,
@@ -1041,42 +1380,92 @@ class JobService:
         if not path.exists():
             return {}, {}
         try:
-            with Image.open(path) as img:
-                rgb = img.convert("RGB")
-                width, height = rgb.size
-                if width < 16 or height < 16:
-                    global_vec = self._primary_embedding_from_image(rgb)
-                    roi = {"global": RoiRegion(category="global", bbox=[0.0, 0.0, 1.0, 1.0], confidence=0.5)}
-                    return {"global": global_vec}, roi
-
-                def crop_box(x1: float, y1: float, x2: float, y2: float) -> tuple[int, int, int, int]:
-                    left = max(0, min(width - 1, int(width * x1)))
-                    top = max(0, min(height - 1, int(height * y1)))
-                    right = max(left + 1, min(width, int(width * x2)))
-                    bottom = max(top + 1, min(height, int(height * y2)))
-                    return (left, top, right, bottom)
-
-                vectors: dict[str, list[float]] = {"global": self._primary_embedding_from_image(rgb)}
-                regions: dict[str, RoiRegion] = {
-                    "global": RoiRegion(category="global", bbox=[0.0, 0.0, 1.0, 1.0], confidence=0.92)
-                }
-                vectors["top"] = self._primary_embedding_from_image(rgb.crop(crop_box(0.10, 0.05, 0.90, 0.46)))
-                regions["top"] = RoiRegion(category="top", bbox=[0.10, 0.05, 0.90, 0.46], confidence=0.86)
-                vectors["bottom"] = self._primary_embedding_from_image(rgb.crop(crop_box(0.16, 0.40, 0.84, 0.78)))
-                regions["bottom"] = RoiRegion(category="bottom", bbox=[0.16, 0.40, 0.84, 0.78], confidence=0.88)
-                vectors["outer"] = self._primary_embedding_from_image(rgb.crop(crop_box(0.06, 0.02, 0.94, 0.60)))
-                regions["outer"] = RoiRegion(category="outer", bbox=[0.06, 0.02, 0.94, 0.60], confidence=0.74)
-                vectors["shoes"] = self._primary_embedding_from_image(rgb.crop(crop_box(0.15, 0.80, 0.85, 0.99)))
-                regions["shoes"] = RoiRegion(category="shoes", bbox=[0.15, 0.80, 0.85, 0.99], confidence=0.70)
-
-                bag_left = self._primary_embedding_from_image(rgb.crop(crop_box(0.00, 0.25, 0.38, 0.80)))
-                bag_right = self._primary_embedding_from_image(rgb.crop(crop_box(0.62, 0.25, 1.00, 0.80)))
-                vectors["bag"] = self._normalize_vector([(a + b) / 2.0 for a, b in zip(bag_left, bag_right)])
-                regions["bag"] = RoiRegion(category="bag", bbox=[0.00, 0.25, 1.00, 0.80], confidence=0.58)
-                return vectors, regions
+            rgb = self._upload_rgb(path)
+            width, height = rgb.size
+            if width < 16 or height < 16:
+                global_vec = self._primary_embedding_from_image(rgb)
+                roi = {"global": RoiRegion(category="global", bbox=[0.0, 0.0, 1.0, 1.0], confidence=0.5)}
+                return {"global": global_vec}, roi
+
+            def crop_box(x1: float, y1: float, x2: float, y2: float) -> tuple[int, int, int, int]:
+                left = max(0, min(width - 1, int(width * x1)))
+                top = max(0, min(height - 1, int(height * y1)))
+                right = max(left + 1, min(width, int(width * x2)))
+                bottom = max(top + 1, min(height, int(height * y2)))
+                return (left, top, right, bottom)
+
+            def embed(box: Optional[tuple[float, float, float, float]]) -> list[float]:
+                return self._primary_embedding_from_image(rgb if box is None else rgb.crop(crop_box(*box)))
+
+            boxes: dict[str, Optional[tuple[float, float, float, float]]] = {
+                "global": None,
+                "top": (0.10, 0.05, 0.90, 0.46),
+                "bottom": (0.16, 0.40, 0.84, 0.78),
+                "outer": (0.06, 0.02, 0.94, 0.60),
+                "shoes": (0.15, 0.80, 0.85, 0.99),
+                "bag_left": (0.00, 0.25, 0.38, 0.80),
+                "bag_right": (0.62, 0.25, 1.00, 0.80),
+            }
+            futures = {name: self._roi_executor.submit(embed, box) for name, box in boxes.items()}
+            vectors: dict[str, list[float]] = {
+                name: futures[name].result() for name in ("global", "top", "bottom", "outer", "shoes")
+            }
+            regions: dict[str, RoiRegion] = {
+                "global": RoiRegion(category="global", bbox=[0.0, 0.0, 1.0, 1.0], confidence=0.92),
+                "top": RoiRegion(category="top", bbox=[0.10, 0.05, 0.90, 0.46], confidence=0.86),
+                "bottom": RoiRegion(category="bottom", bbox=[0.16, 0.40, 0.84, 0.78], confidence=0.88),
+                "outer": RoiRegion(category="outer", bbox=[0.06, 0.02, 0.94, 0.60], confidence=0.74),
+                "shoes": RoiRegion(category="shoes", bbox=[0.15, 0.80, 0.85, 0.99], confidence=0.70),
+            }
+
+            bag_left = futures["bag_left"].result()
+            bag_right = futures["bag_right"].result()
+            vectors["bag"] = self._normalize_vector([(a + b) / 2.0 for a, b in zip(bag_left, bag_right)])
+            regions["bag"] = RoiRegion(category="bag", bbox=[0.00, 0.25, 1.00, 0.80], confidence=0.58)
+            return vectors, regions
         except Exception:
             return {}, {}
 
+    def _query_features(
+        self, upload_image_path: Optional[str]
+    ) -> tuple[dict[str, list[float]], dict[str, RoiRegion], dict[str, tuple[list[float], float, float]]]:
+        key = ""
+        if upload_image_path:
+            try:
+                key = hashlib.blake2b(Path(upload_image_path).read_bytes(), digest_size=16).hexdigest()
+            except OSError:
+                key = ""
+        if key:
+            with self._upload_image_lock:
+                cached = self._query_feature_cache.get(key)
+                if cached is not None:
+                    self._query_feature_cache.move_to_end(key)
+                    query_vectors, roi_debug, query_style = cached
+                    return query_vectors, dict(roi_debug), query_style
+        query_vectors, roi_debug = self._query_vectors_by_category(upload_image_path)
+        query_style = self._query_style_signatures_by_category(upload_image_path)
+        if key and query_vectors:
+            with self._upload_image_lock:
+                self._query_feature_cache[key] = (query_vectors, roi_debug, query_style)
+                while len(self._query_feature_cache) > QUERY_FEATURE_CACHE_SIZE:
+                    self._query_feature_cache.popitem(last=False)
+        return query_vectors, dict(roi_debug), query_style
+
+    def _upload_rgb(self, path: Path) -> "Image.Image":
+        key = (str(path), path.stat().st_mtime_ns)
+        with self._upload_image_lock:
+            cached = self._upload_image_cache.get(key)
+            if cached is not None:
+                self._upload_image_cache.move_to_end(key)
+                return cached
+        with Image.open(path) as img:
+            rgb = img.convert("RGB")
+        with self._upload_image_lock:
+            self._upload_image_cache[key] = rgb
+            while len(self._upload_image_cache) > UPLOAD_IMAGE_CACHE_SIZE:
+                self._upload_image_cache.popitem(last=False)
+        return rgb
+
     def _query_semantic_vectors_by_category(self, upload_image_path: Optional[str]) -> dict[str, list[float]]:
         # Semantic side-channel is disabled because we already use a single
         # primary embedding space (hist or clip) end-to-end.
@@ -1091,6 +1480,26 @@ class JobService:
         item_vec = self._item_semantic_embedding(item)
         return self._cosine_similarity(query_vec, item_vec)
 
+    @staticmethod
+    def _combine_scores(
+        subscores: list[tuple[float, float, float, float, float, float]], clip_primary_active: bool
+    ) -> tuple[list[float], list[float]]:
+        # Rows are (image, style, color, attr, price, penalty); returns (final, meta) per row.
+        final_weights = FINAL_SCORE_WEIGHTS_CLIP if clip_primary_active else FINAL_SCORE_WEIGHTS
+        if not subscores:
+            return [], []
+        if np is not None:
+            table = np.asarray(subscores, dtype=np.float64)
+            final = (table[:, :5] @ np.asarray(final_weights)) * table[:, 5]
+            meta = table[:, 1:4] @ np.asarray(META_SCORE_WEIGHTS)
+            return final.tolist(), meta.tolist()
+        finals: list[float] = []
+        metas: list[float] = []
+        for row in subscores:
+            finals.append(sum(w * v for w, v in zip(final_weights, row)) * row[5])
+            metas.append(sum(w * v for w, v in zip(META_SCORE_WEIGHTS, row[1:4])))
+        return finals, metas
+
     @staticmethod
     def _effective_auto_match_count(look_count: int, category: Optional[str]) -> int:
         if category is not None:
@@ -1108,30 +1517,36 @@ class JobService:
 
     @staticmethod
     def _select_balanced_candidates(
-        candidates: list[tuple[float, CatalogItemRecord, ScoreBreakdown, list[str]]],
+        candidates: list[tuple[float, CatalogItemRecord, int]],
         look_count: int,
         required_categories: list[str],
-    ) -> list[tuple[float, CatalogItemRecord, ScoreBreakdown, list[str]]]:
-        selected: list[tuple[float, CatalogItemRecord, ScoreBreakdown, list[str]]] = []
+    ) -> list[tuple[float, CatalogItemRecord, int]]:
+        # Candidates may arrive unsorted; rank is (final desc, arrival order), as a stable sort gives.
+        selected: list[tuple[float, CatalogItemRecord, int]] = []
         used_product_ids: set[str] = set()
+        order = [(-row[0], idx) for idx, row in enumerate(candidates)]
 
         for required_category in required_categories:
-            picked = next(
+            best = min(
                 (
-                    row
-                    for row in candidates
-                    if row[1].category == required_category and row[1].product_id not in used_product_ids
+                    key
+                    for key in order
+                    if candidates[key[1]][1].category == required_category
+                    and candidates[key[1]][1].product_id not in used_product_ids
                 ),
-                None,
+                default=None,
             )
-            if picked is None:
+            if best is None:
                 continue
+            picked = candidates[best[1]]
             selected.append(picked)
             used_product_ids.add(picked[1].product_id)
 
-        for row in candidates:
-            if len(selected) >= look_count:
-                break
+        # Fill the remaining slots by popping a heap rather than sorting every candidate.
+        heapq.heapify(order)
+        while order and len(selected) < look_count:
+            _, idx = heapq.heappop(order)
+            row = candidates[idx]
             if row[1].product_id in used_product_ids:
                 continue
             selected.append(row)
@@ -1173,7 +1588,7 @@ class JobService:
         products: dict[str, CatalogItemRecord] = {}
         seeds = self._catalog_seed_queries()
         target_per_category = max(1, max(limit_per_category, CATALOG_MIN_ITEMS_PER_CATEGORY))
-        if httpx is None or BeautifulSoup is None:
+        if httpx is None or (BeautifulSoup is None and LexborHTMLParser is None):
             fallback = self._fallback_catalog_items()
             with self._lock:
                 if mode == CrawlMode.full:
@@ -1181,16 +1596,18 @@ class JobService:
                 for item in fallback:
                     self._catalog[item.product_id] = item
                 snapshot = list(self._catalog.values())
-                self._sync_qdrant(snapshot, mode=mode)
-                self._persist_locked()
+            self._sync_qdrant(snapshot, mode=mode)
+            with self._lock:
+                self._persist_catalog_locked()
             self._export_catalog_datasets(snapshot)
             return len(fallback), len(fallback)
 
         with httpx.Client(timeout=10.0, headers={"User-Agent": "Mozilla/5.0"}) as client:
-            for category, queries in seeds.items():
+
+            def crawl_category(category: str, queries: list[str]) -> list[CatalogItemRecord]:
                 merged: dict[str, CatalogItemRecord] = {}
                 if not queries:
-                    continue
+                    return []
                 per_query_target = max(80, math.ceil(target_per_category / len(queries)))
                 for query in queries:
                     needed = target_per_category - len(merged)
@@ -1215,19 +1632,30 @@ class JobService:
                 if len(discovered_items) < target_per_category and CATALOG_ALLOW_SYNTHETIC_PADDING:
                     fallback = self._fallback_items_for_category(category, target_per_category - len(discovered_items))
                     discovered_items.extend(fallback)
-                for item in discovered_items:
-                    products[item.product_id] = item
-
-        indexed = 0
-        with httpx.Client(timeout=4.0, headers={"User-Agent": "Mozilla/5.0"}) as embed_client:
-            for item in products.values():
-                if not item.embedding:
-                    if CATALOG_CRAWL_USE_IMAGE_EMBEDDING:
-                        item.embedding = self._embedding_from_url(item.image_url, client=embed_client)
-                    if not item.embedding:
-                        item.embedding = self._embedding_from_text(f"{item.category} {item.product_name}")
-                if item.embedding:
-                    indexed += 1
+                return discovered_items
+
+            # Categories crawl independently over the shared connection pool; pages within a
+            # keyword stay sequential because each one decides whether there is a next page.
+            with ThreadPoolExecutor(max_workers=min(CATALOG_CRAWL_WORKERS, max(1, len(seeds)))) as pool:
+                for discovered_items in pool.map(crawl_category, seeds.keys(), seeds.values()):
+                    for item in discovered_items:
+                        products[item.product_id] = item
+
+        todo = [item for item in products.values() if not item.embedding]
+
+        def backfill_embedding(item: CatalogItemRecord) -> array.array:
+            embedding = array.array("f")
+            if CATALOG_CRAWL_USE_IMAGE_EMBEDDING:
+                embedding = array.array("f", self._embedding_from_url(item.image_url))
+            if not embedding:
+                embedding = array.array("f", self._embedding_from_text(f"{item.category} {item.product_name}"))
+            return embedding
+
+        # Same fan-out as rebuild_catalog_index: image downloads dominate the backfill.
+        with ThreadPoolExecutor(max_workers=CATALOG_INDEX_WORKERS) as pool:
+            for item, embedding in zip(todo, pool.map(backfill_embedding, todo)):
+                item.embedding = embedding
+        indexed = sum(1 for item in products.values() if item.embedding)
 
         if not products:
             products = {item.product_id: item for item in self._fallback_catalog_items()}
@@ -1236,12 +1664,14 @@ class JobService:
         with self._lock:
             if mode == CrawlMode.full:
                 self._catalog = {}
-                self._item_style_signature_cache = {}
+                with self._item_style_signature_lock:
+                    self._item_style_signature_cache.clear()
                 self._item_semantic_embedding_cache = {}
             self._catalog.update(products)
             snapshot = list(self._catalog.values())
-            self._sync_qdrant(snapshot, mode=mode)
-            self._persist_locked()
+        self._sync_qdrant(snapshot, mode=mode)
+        with self._lock:
+            self._persist_catalog_locked()
         self._export_catalog_datasets(snapshot)
         return len(products), indexed
 
@@ -1256,7 +1686,12 @@ class JobService:
         if not QDRANT_ENABLED or QdrantClient is None or qdrant_models is None:
             return None
         try:
-            client = QdrantClient(url=QDRANT_URL, timeout=QDRANT_TIMEOUT_SECONDS)
+            client = QdrantClient(
+                url=QDRANT_URL,
+                timeout=QDRANT_TIMEOUT_SECONDS,
+                prefer_grpc=QDRANT_PREFER_GRPC,
+                grpc_port=QDRANT_GRPC_PORT,
+            )
             return client
         except Exception:
             return None
@@ -1277,32 +1712,60 @@ class JobService:
                 existing_size = getattr(vectors, "size", None)
             if isinstance(existing_size, int) and existing_size > 0 and existing_size != vector_size:
                 self._qdrant_client.delete_collection(QDRANT_COLLECTION)
-                self._qdrant_client.recreate_collection(
-                    collection_name=QDRANT_COLLECTION,
-                    vectors_config=qdrant_models.VectorParams(
-                        size=vector_size,
-                        distance=qdrant_models.Distance.COSINE,
-                    ),
-                )
+                self._create_qdrant_collection(vector_size)
         except Exception:
-            self._qdrant_client.recreate_collection(
-                collection_name=QDRANT_COLLECTION,
-                vectors_config=qdrant_models.VectorParams(
-                    size=vector_size,
-                    distance=qdrant_models.Distance.COSINE,
-                ),
+            self._create_qdrant_collection(vector_size)
+
+    def _create_qdrant_collection(self, vector_size: int) -> None:
+        # A fresh collection holds none of the points remembered as pushed.
+        self._qdrant_point_digests.clear()
+        quantization_config = None
+        if QDRANT_SCALAR_QUANTIZATION:
+            # int8 copies of the vectors stay in RAM for search; originals are used for rescoring.
+            quantization_config = qdrant_models.ScalarQuantization(
+                scalar=qdrant_models.ScalarQuantizationConfig(
+                    type=qdrant_models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
             )
+        self._qdrant_client.recreate_collection(
+            collection_name=QDRANT_COLLECTION,
+            vectors_config=qdrant_models.VectorParams(
+                size=vector_size,
+                distance=qdrant_models.Distance.COSINE,
+            ),
+            quantization_config=quantization_config,
+        )
+        # Searches filter on these payload fields; indexed fields keep filtered HNSW search fast.
+        for field_name, schema in (
+            ("category", qdrant_models.PayloadSchemaType.KEYWORD),
+            ("gender", qdrant_models.PayloadSchemaType.KEYWORD),
+            ("price", qdrant_models.PayloadSchemaType.INTEGER),
+        ):
+            try:
+                self._qdrant_client.create_payload_index(
+                    collection_name=QDRANT_COLLECTION, field_name=field_name, field_schema=schema
+                )
+            except Exception:
+                pass
 
     def _sync_qdrant(self, items: list[CatalogItemRecord], mode: CrawlMode) -> None:
-        if self._qdrant_client is None or qdrant_models is None:
+        # Called without self._lock: vector uploads can take minutes and must not stall
+        # job polling. Syncs are serialized among themselves instead.
+        with self._qdrant_sync_lock:
+            self._push_qdrant_points(items, mode)
+        with self._lock:
             self._set_crawl_timestamp(mode)
+
+    def _push_qdrant_points(self, items: list[CatalogItemRecord], mode: CrawlMode) -> None:
+        if self._qdrant_client is None or qdrant_models is None:
             return
         if self._semantic_backend == "clip":
             valid = [item for item in items if item.embedding and len(item.embedding) >= 512]
         else:
             valid = [item for item in items if item.embedding]
         if not valid:
-            self._set_crawl_timestamp(mode)
             return
         try:
             self._ensure_qdrant_collection(len(valid[0].embedding))
@@ -1312,50 +1775,140 @@ class JobService:
                 except Exception:
                     pass
                 self._ensure_qdrant_collection(len(valid[0].embedding))
-            points = []
-            for item in valid:
-                payload = {
-                    "product_id": item.product_id,
-                    "category": item.category,
-                    "gender": item.gender.value,
-                    "brand": item.brand,
-                    "price": item.price if item.price is not None else -1,
-                    "product_url": item.product_url,
-                    "image_url": item.image_url,
-                    "updated_at": item.updated_at.isoformat(),
-                }
-                pid = self._qdrant_point_id(item.product_id)
-                points.append(qdrant_models.PointStruct(id=pid, vector=item.embedding, payload=payload))
-            if points:
-                for idx in range(0, len(points), max(1, QDRANT_UPSERT_BATCH_SIZE)):
-                    batch = points[idx : idx + max(1, QDRANT_UPSERT_BATCH_SIZE)]
-                    self._qdrant_client.upsert(collection_name=QDRANT_COLLECTION, points=batch, wait=QDRANT_UPSERT_WAIT)
+                self._qdrant_point_digests.clear()
+                points = [
+                    qdrant_models.PointStruct(
+                        id=self._qdrant_point_id(item.product_id),
+                        vector=item.embedding.tolist(),
+                        payload=self._qdrant_payload(item),
+                    )
+                    for item in valid
+                ]
+                # Build HNSW once after the bulk load instead of incrementally per batch.
+                self._set_qdrant_indexing_threshold(0)
+                try:
+                    self._qdrant_client.upload_points(
+                        collection_name=QDRANT_COLLECTION,
+                        points=points,
+                        batch_size=max(1, QDRANT_UPSERT_BATCH_SIZE),
+                        parallel=QDRANT_UPLOAD_PARALLEL,
+                        wait=QDRANT_UPSERT_WAIT,
+                    )
+                finally:
+                    self._set_qdrant_indexing_threshold(QDRANT_INDEXING_THRESHOLD)
+                for item in valid:
+                    self._qdrant_point_digests[item.product_id] = self._qdrant_point_digest(item)
+            else:
+                self._push_qdrant_changes(valid)
         except Exception:
             # Degrade gracefully: crawl/index should still complete even if vector sync is unstable.
             pass
-        self._set_crawl_timestamp(mode)
+
+    def _push_qdrant_changes(self, items: list[CatalogItemRecord]) -> None:
+        # Incremental sync: points whose vector and payload match the last push are skipped,
+        # points with only a new payload get a payload update, the rest a full upsert.
+        upserts: list[tuple[CatalogItemRecord, tuple[bytes, bytes]]] = []
+        payload_updates: list[tuple[CatalogItemRecord, tuple[bytes, bytes]]] = []
+        for item in items:
+            digest = self._qdrant_point_digest(item)
+            known = self._qdrant_point_digests.get(item.product_id)
+            if known == digest:
+                continue
+            if known is not None and known[0] == digest[0]:
+                payload_updates.append((item, digest))
+            else:
+                upserts.append((item, digest))
+
+        batch_size = max(1, QDRANT_UPSERT_BATCH_SIZE)
+
+        def upsert_batch(batch: list[tuple[CatalogItemRecord, tuple[bytes, bytes]]]) -> None:
+            points = [
+                qdrant_models.PointStruct(
+                    id=self._qdrant_point_id(item.product_id),
+                    vector=item.embedding.tolist(),
+                    payload=self._qdrant_payload(item),
+                )
+                for item, _ in batch
+            ]
+            self._qdrant_client.upsert(collection_name=QDRANT_COLLECTION, points=points, wait=QDRANT_UPSERT_WAIT)
+
+        def payload_batch(batch: list[tuple[CatalogItemRecord, tuple[bytes, bytes]]]) -> None:
+            operations = [
+                qdrant_models.SetPayloadOperation(
+                    set_payload=qdrant_models.SetPayload(
+                        payload=self._qdrant_payload(item), points=[self._qdrant_point_id(item.product_id)]
+                    )
+                )
+                for item, _ in batch
+            ]
+            self._qdrant_client.batch_update_points(
+                collection_name=QDRANT_COLLECTION, update_operations=operations, wait=QDRANT_UPSERT_WAIT
+            )
+
+        jobs = [(upsert_batch, upserts[idx : idx + batch_size]) for idx in range(0, len(upserts), batch_size)]
+        jobs += [
+            (payload_batch, payload_updates[idx : idx + batch_size]) for idx in range(0, len(payload_updates), batch_size)
+        ]
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=QDRANT_UPLOAD_PARALLEL) as pool:
+            futures = [(pool.submit(send, batch), batch) for send, batch in jobs]
+            failed: Optional[Exception] = None
+            for future, batch in futures:
+                try:
+                    future.result()
+                except Exception as exc:
+                    failed = failed or exc
+                    continue
+                # Only batches Qdrant accepted are remembered, so failed ones are retried next sync.
+                for item, digest in batch:
+                    self._qdrant_point_digests[item.product_id] = digest
+        if failed is not None:
+            raise failed
+
+    @staticmethod
+    def _qdrant_payload(item: CatalogItemRecord) -> dict:
+        return {
+            "product_id": item.product_id,
+            "category": item.category,
+            "gender": item.gender.value,
+            "brand": item.brand,
+            "price": item.price if item.price is not None else -1,
+            "product_url": item.product_url,
+            "image_url": item.image_url,
+            "updated_at": item.updated_at.isoformat(),
+        }
+
+    @classmethod
+    def _qdrant_point_digest(cls, item: CatalogItemRecord) -> tuple[bytes, bytes]:
+        vector_digest = hashlib.blake2b(item.embedding.tobytes(), digest_size=16).digest()
+        payload_digest = hashlib.blake2b(
+            json.dumps(cls._qdrant_payload(item), sort_keys=True).encode("utf-8"), digest_size=16
+        ).digest()
+        return vector_digest, payload_digest
+
+    def _set_qdrant_indexing_threshold(self, threshold: int) -> None:
+        try:
+            self._qdrant_client.update_collection(
+                collection_name=QDRANT_COLLECTION,
+                optimizers_config=qdrant_models.OptimizersConfigDiff(indexing_threshold=threshold),
+            )
+        except Exception:
+            pass
 
     def _upsert_qdrant_item(self, item: CatalogItemRecord) -> None:
         if self._qdrant_client is None or qdrant_models is None or not item.embedding:
             return
         try:
             self._ensure_qdrant_collection(len(item.embedding))
-            payload = {
-                "product_id": item.product_id,
-                "category": item.category,
-                "gender": item.gender.value,
-                "brand": item.brand,
-                "price": item.price if item.price is not None else -1,
-                "product_url": item.product_url,
-                "image_url": item.image_url,
-                "updated_at": item.updated_at.isoformat(),
-            }
             pid = self._qdrant_point_id(item.product_id)
             self._qdrant_client.upsert(
                 collection_name=QDRANT_COLLECTION,
-                points=[qdrant_models.PointStruct(id=pid, vector=item.embedding, payload=payload)],
+                points=[qdrant_models.PointStruct(id=pid, vector=item.embedding.tolist(), payload=self._qdrant_payload(item))],
                 wait=QDRANT_UPSERT_WAIT,
             )
+            with self._qdrant_sync_lock:
+                self._qdrant_point_digests[item.product_id] = self._qdrant_point_digest(item)
         except Exception:
             pass
 
@@ -1372,10 +1925,17 @@ class JobService:
         category: Optional[str],
         preferred_categories: Optional[list[str]],
         limit: int,
+        target_gender: TargetGender = TargetGender.unisex,
+        price_cap: Optional[int] = None,
+        composed_queries: Optional[dict[str, list[float]]] = None,
     ) -> list[CatalogItemRecord]:
         if self._qdrant_client is None or qdrant_models is None:
+            # Group once so each category below is a dict lookup, not another full scan.
+            by_category: dict[str, list[CatalogItemRecord]] = {}
+            for item in fallback_items:
+                by_category.setdefault(item.category, []).append(item)
             if category:
-                scoped = [item for item in fallback_items if item.category == category]
+                scoped = by_category.get(category)
                 if scoped:
                     return scoped[: max(200, limit * 4)]
                 return fallback_items[: max(200, limit * 4)]
@@ -1385,8 +1945,8 @@ class JobService:
             seen: set[str] = set()
             for cat in target_categories:
                 count = 0
-                for item in fallback_items:
-                    if item.product_id in seen or item.category != cat:
+                for item in by_category.get(cat, ()):
+                    if item.product_id in seen:
                         continue
                     selected.append(item)
                     seen.add(item.product_id)
@@ -1412,46 +1972,190 @@ class JobService:
                 candidates.append(item)
                 seen.add(product_id)
 
-        def search_once(query_vector: list[float], category_filter: Optional[str], topk: int) -> None:
-            if not query_vector:
-                return
-            query_filter = None
-            if category_filter:
-                query_filter = qdrant_models.Filter(
-                    must=[qdrant_models.FieldCondition(key="category", match=qdrant_models.MatchValue(value=category_filter))]
+        # Gender and price are checked server-side too, so fewer points come back only to be dropped.
+        # Items without a price carry -1, which always passes the price range.
+        shared_conditions = []
+        if target_gender != TargetGender.unisex:
+            shared_conditions.append(
+                qdrant_models.FieldCondition(
+                    key="gender", match=qdrant_models.MatchAny(any=[target_gender.value, TargetGender.unisex.value])
                 )
+            )
+        if price_cap is not None:
+            shared_conditions.append(qdrant_models.FieldCondition(key="price", range=qdrant_models.Range(lte=price_cap)))
+
+        def query_request(query_vector: list[float], category_filter: Optional[str], topk: int):
+            conditions = list(shared_conditions)
+            if category_filter:
+                conditions.append(qdrant_models.FieldCondition(key="category", match=qdrant_models.MatchValue(value=category_filter)))
+            query_filter = qdrant_models.Filter(must=conditions) if conditions else None
+            return qdrant_models.QueryRequest(query=query_vector, filter=query_filter, limit=topk, with_payload=True)
+
+        def search_batch(searches: list[tuple[list[float], Optional[str], int]]) -> list[list]:
+            # One round trip for every query; empty vectors keep their slot with no points.
+            slots = [idx for idx, (query_vector, _, _) in enumerate(searches) if query_vector]
+            results: list[list] = [[] for _ in searches]
+            if not slots:
+                return results
             try:
-                points = self._qdrant_client.search(
+                responses = self._qdrant_client.query_batch_points(
                     collection_name=QDRANT_COLLECTION,
-                    query_vector=query_vector,
-                    query_filter=query_filter,
-                    limit=topk,
+                    requests=[query_request(*searches[idx]) for idx in slots],
                 )
             except Exception:
-                return
-            append_from_points(points or [])
+                return results
+            for idx, response in zip(slots, responses):
+                results[idx] = response.points or []
+            return results
 
         if category:
-            query_vector = self._compose_query_vector(category, query_vectors)
-            search_once(query_vector, category, limit)
+            scoped, global_scoped = search_batch(
+                [
+                    (self._composed_query(category, query_vectors, composed_queries), category, limit),
+                    (query_vectors.get("global", []), category, limit),
+                ]
+            )
+            append_from_points(scoped)
             if not candidates:
-                search_once(query_vectors.get("global", []), category, limit)
+                append_from_points(global_scoped)
             return candidates or fallback_items
 
         target_categories = preferred_categories or CATEGORY_QUERY_PRIORITY
         per_category_topk = max(12, limit // max(1, len(target_categories)))
-        for cat in target_categories:
-            query_vector = self._compose_query_vector(cat, query_vectors)
-            search_once(query_vector, cat, per_category_topk)
-
+        searches = [
+            (self._composed_query(cat, query_vectors, composed_queries), cat, per_category_topk) for cat in target_categories
+        ]
         # Add global search to capture cross-category alternatives after category-first retrieval.
-        search_once(query_vectors.get("global", []), None, limit)
+        searches.append((query_vectors.get("global", []), None, limit))
+        for points in search_batch(searches):
+            append_from_points(points)
         return candidates or fallback_items
 
+    def _image_similarities(
+        self,
+        items: list[CatalogItemRecord],
+        query_vectors: dict[str, list[float]],
+        composed_queries: Optional[dict[str, list[float]]] = None,
+    ) -> list[float]:
+        # Signed cosine of each item against its category query, one matrix-vector product per category.
+        scores = [0.0] * len(items)
+        rows_by_category: dict[str, list[int]] = {}
+        for idx, item in enumerate(items):
+            if item.embedding:
+                rows_by_category.setdefault(item.category, []).append(idx)
+        index = self._catalog_embedding_index() if rows_by_category else None
+        for cat, rows in rows_by_category.items():
+            query = self._composed_query(cat, query_vectors, composed_queries)
+            rows = [idx for idx in rows if len(items[idx].embedding) == len(query)]
+            if not query or not rows:
+                continue
+            if np is None:
+                # The query norm is shared by every row in the category; only item norms vary.
+                query_norm = math.sqrt(sum(v * v for v in query))
+                if query_norm == 0:
+                    continue
+                for idx in rows:
+                    embedding = items[idx].embedding
+                    item_norm = math.sqrt(sum(v * v for v in embedding))
+                    if item_norm == 0:
+                        continue
+                    dot = sum(a * b for a, b in zip(query, embedding))
+                    scores[idx] = max(-1.0, min(1.0, dot / (query_norm * item_norm)))
+                continue
+            query_arr = np.asarray(query, dtype=np.float64)
+            query_norm = float(np.linalg.norm(query_arr))
+            if query_norm == 0:
+                continue
+            query_unit = query_arr / query_norm
+            # Catalog rows come pre-normalized from the shared matrix; anything else
+            # (fallback items, rows replaced since the matrix was built) is stacked here.
+            indexed: list[int] = []
+            matrix_rows: list[int] = []
+            loose: list[int] = []
+            if index is not None and index.matrix.shape[1] == len(query):
+                for idx in rows:
+                    row = index.rows.get(items[idx].product_id)
+                    if row is not None and index.embeddings[row] is items[idx].embedding:
+                        indexed.append(idx)
+                        matrix_rows.append(row)
+                    else:
+                        loose.append(idx)
+            else:
+                loose = rows
+            if indexed:
+                candidate_rows = index.matrix[matrix_rows].astype(np.float32, copy=False)
+                sims = np.clip((candidate_rows @ query_unit.astype(np.float32)) * index.scale, -1.0, 1.0)
+                for idx, sim in zip(indexed, sims.tolist()):
+                    scores[idx] = sim
+            if loose:
+                matrix = np.stack([np.frombuffer(items[idx].embedding, dtype=np.float32) for idx in loose]).astype(np.float64)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    sims = (matrix @ query_unit) / np.linalg.norm(matrix, axis=1)
+                sims = np.clip(np.nan_to_num(sims, nan=0.0), -1.0, 1.0)
+                for idx, sim in zip(loose, sims.tolist()):
+                    scores[idx] = sim
+        return scores
+
+    def _catalog_embedding_index(self) -> Optional[CatalogEmbeddingIndex]:
+        if np is None:
+            return None
+        with self._lock:
+            version = self._catalog_version
+            index = self._embedding_index
+            if index is not None and index.version == version:
+                return index
+            entries = [(item.product_id, item.embedding) for item in self._catalog.values() if item.embedding]
+        with self._embedding_index_lock:
+            index = self._embedding_index
+            if index is not None and index.version >= version:
+                return index
+            dims = Counter(len(embedding) for _, embedding in entries)
+            dim = dims.most_common(1)[0][0] if dims else 0
+            entries = [(product_id, embedding) for product_id, embedding in entries if len(embedding) == dim]
+            matrix = np.zeros((len(entries), dim), dtype=np.float32)
+            for row, (_, embedding) in enumerate(entries):
+                matrix[row] = np.frombuffer(embedding, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+            scale = 1.0
+            if CATALOG_MATRIX_DTYPE == "float16":
+                matrix = matrix.astype(np.float16)
+            elif CATALOG_MATRIX_DTYPE == "int8":
+                matrix = np.round(matrix * 127.0).astype(np.int8)
+                scale = 1.0 / 127.0
+            index = CatalogEmbeddingIndex(
+                version=version,
+                rows={product_id: row for row, (product_id, _) in enumerate(entries)},
+                embeddings=[embedding for _, embedding in entries],
+                matrix=matrix,
+                scale=scale,
+            )
+            self._embedding_index = index
+        return index
+
+    def _composed_query(
+        self,
+        category: str,
+        query_vectors: dict[str, list[float]],
+        composed_queries: Optional[dict[str, list[float]]],
+    ) -> list[float]:
+        if composed_queries is not None:
+            if category in composed_queries:
+                return composed_queries[category]
+            # Categories without an ROI vector compose to the global vector.
+            if category not in query_vectors:
+                return query_vectors.get("global", [])
+        return self._compose_query_vector(category, query_vectors)
+
     def _compose_query_vector(self, category: str, query_vectors: dict[str, list[float]]) -> list[float]:
         cat_vec = query_vectors.get(category, [])
         global_vec = query_vectors.get("global", [])
         if cat_vec and global_vec and len(cat_vec) == len(global_vec):
+            if np is not None:
+                mixed_arr = 0.82 * np.asarray(cat_vec, dtype=np.float64) + 0.18 * np.asarray(global_vec, dtype=np.float64)
+                norm = float(np.linalg.norm(mixed_arr))
+                return (mixed_arr / norm if norm else mixed_arr).tolist()
             mixed = [0.82 * c + 0.18 * g for c, g in zip(cat_vec, global_vec)]
             return self._normalize_vector(mixed)
         if cat_vec:
@@ -1504,6 +2208,7 @@ class JobService:
             writer.writeheader()
 
             used_paths: set[str] = set()
+            exports: list[tuple[CatalogItemRecord, Path, Path]] = []
             rows = sorted(catalog_items, key=lambda item: (item.category, item.product_id))
             for item in rows:
                 if not CATALOG_DATASET_INCLUDE_FALLBACK and item.product_id.startswith("fallback-"):
@@ -1523,10 +2228,14 @@ class JobService:
                     export_file = category_dir / f"{stem}_{suffix}.jpg"
                     suffix += 1
 
-                with Image.open(cache_file) as img:
-                    img.convert("RGB").save(export_file, format="JPEG", quality=92)
-
                 used_paths.add(str(export_file))
+                exports.append((item, cache_file, export_file))
+
+            # Export paths are assigned above in order; the file work itself is I/O bound.
+            with ThreadPoolExecutor(max_workers=CATALOG_INDEX_WORKERS) as pool:
+                list(pool.map(lambda job: self._export_catalog_image(job[1], job[2]), exports))
+
+            for item, cache_file, export_file in exports:
                 writer.writerow(
                     {
                         "product_id": item.product_id,
@@ -1541,6 +2250,18 @@ class JobService:
                     }
                 )
 
+    @staticmethod
+    def _export_catalog_image(cache_file: Path, export_file: Path) -> None:
+        with Image.open(cache_file) as img:
+            if img.format != "JPEG" or img.mode != "RGB":
+                img.convert("RGB").save(export_file, format="JPEG", quality=92)
+                return
+        # Cached RGB JPEGs are exported as-is instead of being decoded and re-encoded.
+        try:
+            os.link(cache_file, export_file)
+        except OSError:
+            shutil.copyfile(cache_file, export_file)
+
     @staticmethod
     def _safe_file_token(value: str) -> str:
         token = re.sub(r"[^a-zA-Z0-9._-]+", "_", value.strip())
@@ -1668,12 +2389,10 @@ class JobService:
         resp = client.get(url)
         if resp.status_code != 200:
             return []
-        soup = BeautifulSoup(resp.text, "html.parser")
         records: list[CatalogItemRecord] = []
         seen: set[str] = set()
 
-        for anchor in soup.find_all("a", href=True):
-            href = str(anchor.get("href", ""))
+        for href, image_url, product_name, anchor_text in self._search_page_anchors(resp.text):
             if "/products/" not in href:
                 continue
             product_url = urljoin("https://www.musinsa.com", href)
@@ -1682,12 +2401,6 @@ class JobService:
                 continue
             seen.add(product_url)
             product_id = self._product_id_from_url(product_url)
-            img_tag = anchor.find("img")
-            image_url = ""
-            product_name = ""
-            if img_tag is not None:
-                image_url = str(img_tag.get("src") or img_tag.get("data-src") or "").strip()
-                product_name = str(img_tag.get("alt") or "").strip()
             if not image_url:
                 continue
             if image_url.startswith("//"):
@@ -1695,7 +2408,7 @@ class JobService:
             if image_url.startswith("/"):
                 image_url = urljoin("https://www.musinsa.com", image_url)
             if not product_name:
-                product_name = anchor.get_text(" ", strip=True) or f"{category} item"
+                product_name = anchor_text or f"{category} item"
             record = CatalogItemRecord(
                 product_id=product_id,
                 category=category,
@@ -1703,7 +2416,7 @@ class JobService:
                 product_name=product_name,
                 product_url=product_url,
                 image_url=image_url,
-                price=self._extract_price(anchor.get_text(" ", strip=True)),
+                price=self._extract_price(anchor_text),
                 gender=self._infer_item_gender(product_name=f"{product_name} {product_url}", brand="MUSINSA"),
                 embedding=[],
             )
@@ -1713,25 +2426,52 @@ class JobService:
         return records
 
     @staticmethod
+    def _search_page_anchors(html: str) -> Iterator[tuple[str, str, str, str]]:
+        # (href, image url, image alt, flattened text) of each product anchor. lexbor (selectolax)
+        # is used when installed; BeautifulSoup builds only the product <a> subtrees otherwise.
+        if LexborHTMLParser is not None:
+            for anchor in LexborHTMLParser(html).css('a[href*="/products/"]'):
+                img_tag = anchor.css_first("img")
+                image_url = product_name = ""
+                if img_tag is not None:
+                    attrs = img_tag.attributes
+                    image_url = str(attrs.get("src") or attrs.get("data-src") or "").strip()
+                    product_name = str(attrs.get("alt") or "").strip()
+                # Same text as BeautifulSoup's get_text(" ", strip=True).
+                anchor_text = " ".join(
+                    text
+                    for node in anchor.traverse(include_text=True)
+                    if node.tag == "-text" and (text := (node.text_content or "").strip())
+                )
+                yield str(anchor.attributes.get("href") or ""), image_url, product_name, anchor_text
+            return
+        product_anchors = SoupStrainer("a", href=lambda href: href is not None and "/products/" in href)
+        for anchor in BeautifulSoup(html, HTML_PARSER, parse_only=product_anchors).find_all("a", href=True):
+            img_tag = anchor.find("img")
+            image_url = product_name = ""
+            if img_tag is not None:
+                image_url = str(img_tag.get("src") or img_tag.get("data-src") or "").strip()
+                product_name = str(img_tag.get("alt") or "").strip()
+            yield str(anchor.get("href", "")), image_url, product_name, anchor.get_text(" ", strip=True)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _normalize_url(url: str) -> str:
-        parsed = urlparse(url)
-        clean = parsed._replace(query="", fragment="")
-        return clean.geturl()
+        # Drop fragment, then query; scheme, host and path cannot contain either delimiter.
+        return url.split("#", 1)[0].split("?", 1)[0]
 
     @staticmethod
     def _extract_price(text: str) -> Optional[int]:
-        match = re.search(r"([0-9][0-9,]{3,})", text)
+        match = PRICE_PATTERN.search(text)
         if not match:
             return None
-        try:
-            return int(match.group(1).replace(",", ""))
-        except ValueError:
-            return None
+        # The match starts with a digit, so dropping separators always leaves an int literal.
+        return int(match.group().replace(",", ""))
 
     @staticmethod
     def _product_id_from_url(url: str) -> str:
         token = url.rstrip("/").split("/")[-1]
-        return token or f"P-{uuid4().hex[:8]}"
+        return token or f"P-{hashlib.blake2b(url.encode('utf-8'), digest_size=4).hexdigest()}"
 
     @staticmethod
     def _cosine_similarity(v1: list[float], v2: list[float]) -> float:
@@ -1742,9 +2482,16 @@ class JobService:
     def _cosine_similarity_signed(v1: list[float], v2: list[float]) -> float:
         if not v1 or not v2 or len(v1) != len(v2):
             return 0.0
-        dot = sum(a * b for a, b in zip(v1, v2))
-        n1 = math.sqrt(sum(a * a for a in v1))
-        n2 = math.sqrt(sum(b * b for b in v2))
+        if np is not None and len(v1) >= NUMPY_VECTOR_MIN_LEN:
+            a1 = np.asarray(v1, dtype=np.float64)
+            a2 = np.asarray(v2, dtype=np.float64)
+            dot = float(a1 @ a2)
+            n1 = float(np.linalg.norm(a1))
+            n2 = float(np.linalg.norm(a2))
+        else:
+            dot = sum(a * b for a, b in zip(v1, v2))
+            n1 = math.sqrt(sum(a * a for a in v1))
+            n2 = math.sqrt(sum(b * b for b in v2))
         if n1 == 0 or n2 == 0:
             return 0.0
         return max(-1.0, min(1.0, dot / (n1 * n2)))
@@ -1768,10 +2515,7 @@ class JobService:
     def _coerce_gender(value: str | TargetGender | None, fallback: TargetGender = TargetGender.unisex) -> TargetGender:
         if isinstance(value, TargetGender):
             return value
-        try:
-            return TargetGender(str(value))
-        except Exception:
-            return fallback
+        return TARGET_GENDER_BY_VALUE.get(str(value), fallback)
 
     @staticmethod
     def _is_gender_compatible(target_gender: TargetGender, item_gender: TargetGender) -> bool:
@@ -1782,18 +2526,26 @@ class JobService:
         return target_gender == item_gender
 
     @staticmethod
-    def _contains_any_token(text: str, tokens: list[str]) -> bool:
-        normalized = (text or "").lower()
+    def _contains_any_token(text: str, tokens: tuple[str, ...]) -> bool:
+        # Callers pass lowercased text; token tuples are module constants, so the pattern lookup is a cache hit.
+        return JobService._token_pattern(tokens).search(text) is not None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _token_pattern(tokens: tuple[str, ...]) -> re.Pattern[str]:
+        # One alternation per token list: ASCII tokens must sit on word boundaries,
+        # other tokens (Korean) match as plain substrings.
+        parts = []
         for token in tokens:
             token_norm = token.lower()
             if re.fullmatch(r"[a-z0-9 _-]+", token_norm):
-                if re.search(rf"(?<![a-z0-9]){re.escape(token_norm)}(?![a-z0-9])", normalized):
-                    return True
-            elif token_norm in normalized:
-                return True
-        return False
+                parts.append(rf"(?<![a-z0-9]){re.escape(token_norm)}(?![a-z0-9])")
+            else:
+                parts.append(re.escape(token_norm))
+        return re.compile("|".join(parts) or r"(?!)")
 
     @staticmethod
+    @functools.lru_cache(maxsize=ITEM_SIGNATURE_CACHE_SIZE)
     def _has_opposite_gender_cue(target_gender: TargetGender, text: str) -> bool:
         normalized = (text or "").lower()
         has_men = JobService._contains_any_token(normalized, GENDER_MEN_TOKENS)
@@ -1804,7 +2556,10 @@ class JobService:
             return has_men and not has_women
         return False
 
+    # Item text is fixed per catalog entry and every search re-checks it, so this and
+    # _has_opposite_gender_cue are memoized on their string arguments.
     @staticmethod
+    @functools.lru_cache(maxsize=ITEM_SIGNATURE_CACHE_SIZE)
     def _infer_item_gender(product_name: str, brand: str = "", raw_gender: str = "") -> TargetGender:
         raw = f"{raw_gender} {brand} {product_name}".lower()
         if JobService._contains_any_token(raw, GENDER_UNISEX_TOKENS):
@@ -1820,7 +2575,10 @@ class JobService:
     def _effective_item_gender(self, item: CatalogItemRecord) -> TargetGender:
         if item.gender != TargetGender.unisex:
             return item.gender
-        inferred = self._infer_item_gender(f"{item.product_name} {item.product_url}", item.brand)
+        inferred = item.inferred_gender
+        if inferred is None:
+            inferred = self._infer_item_gender(f"{item.product_name} {item.product_url}", item.brand)
+            item.inferred_gender = inferred
         return inferred
 
     @staticmethod
@@ -1839,11 +2597,12 @@ class JobService:
             score *= 0.35
         if plain_query and JobService._contains_any_token(text, DETAIL_TOKENS):
             score *= 0.72
-        if category == "top" and JobService._contains_any_token(text, ["bra", "뷔스티에", "cami", "캐미", "camisole"]):
+        if category == "top" and JobService._contains_any_token(text, TOP_UNDERWEAR_TOKENS):
             score *= 0.2
         return max(0.05, min(1.0, score))
 
     @staticmethod
+    @functools.lru_cache(maxsize=ITEM_SIGNATURE_CACHE_SIZE)
     def _target_gender_style_penalty(target_gender: TargetGender, category: str, item_name: str) -> float:
         if target_gender == TargetGender.unisex:
             return 1.0
@@ -1851,18 +2610,15 @@ class JobService:
         penalty = 1.0
         if target_gender == TargetGender.men:
             if category == "top":
-                if JobService._contains_any_token(
-                    text,
-                    ["crop", "크롭", "bra", "브라", "bustier", "뷔스티에", "cami", "camisole", "레이스", "lace"],
-                ):
+                if JobService._contains_any_token(text, MEN_TOP_FEMININE_TOKENS):
                     penalty *= 0.15
-                if JobService._contains_any_token(text, ["v-neck", "브이넥", "헨리넥", "henley"]):
+                if JobService._contains_any_token(text, MEN_TOP_NECKLINE_TOKENS):
                     penalty *= 0.55
             if category == "bottom":
-                if JobService._contains_any_token(text, ["leopard", "호피", "floral", "flower", "플라워", "스커트", "skirt"]):
+                if JobService._contains_any_token(text, MEN_BOTTOM_FEMININE_TOKENS):
                     penalty *= 0.20
         if target_gender == TargetGender.women:
-            if category == "top" and JobService._contains_any_token(text, ["oversized workwear", "work jacket"]):
+            if category == "top" and JobService._contains_any_token(text, WOMEN_TOP_WORKWEAR_TOKENS):
                 penalty *= 0.75
         return max(0.05, min(1.0, penalty))
 
@@ -1870,79 +2626,19 @@ class JobService:
     def _color_similarity_score(query_rgb: list[float], item_name: str, item_rgb: Optional[list[float]] = None) -> float:
         if not query_rgb or len(query_rgb) != 3:
             return 0.6
-        palette = {
-            "black": [0.08, 0.08, 0.08],
-            "white": [0.92, 0.92, 0.92],
-            "gray": [0.50, 0.50, 0.50],
-            "navy": [0.10, 0.14, 0.35],
-            "blue": [0.18, 0.30, 0.72],
-            "brown": [0.42, 0.28, 0.20],
-            "beige": [0.78, 0.70, 0.56],
-            "khaki": [0.58, 0.56, 0.36],
-            "green": [0.22, 0.44, 0.28],
-            "red": [0.68, 0.18, 0.18],
-        }
-        aliases = {
-            "블랙": "black",
-            "black": "black",
-            "오프화이트": "white",
-            "white": "white",
-            "화이트": "white",
-            "그레이": "gray",
-            "gray": "gray",
-            "grey": "gray",
-            "네이비": "navy",
-            "navy": "navy",
-            "블루": "blue",
-            "blue": "blue",
-            "브라운": "brown",
-            "brown": "brown",
-            "베이지": "beige",
-            "beige": "beige",
-            "카키": "khaki",
-            "khaki": "khaki",
-            "그린": "green",
-            "green": "green",
-            "레드": "red",
-            "red": "red",
-        }
-        name = item_name.lower()
-        item_colors = [canonical for token, canonical in aliases.items() if token in name]
+        item_colors = JobService._name_colors(item_name.lower())
         if not item_colors and (not item_rgb or len(item_rgb) != 3):
             return 0.65
 
-        def color_dist(a: list[float], b: list[float]) -> float:
-            return math.sqrt(sum((x - y) * (x - y) for x, y in zip(a, b)))
-
-        def closest_palette(rgb: list[float]) -> str:
-            r, g, b = rgb
-            brightness = (r + g + b) / 3.0
-            if brightness < 0.26:
-                if b > (r + 0.015) and b > (g + 0.012):
-                    return "navy"
-                if abs(r - g) < 0.03 and abs(g - b) < 0.03:
-                    return "black"
-            return min(palette.items(), key=lambda kv: color_dist(rgb, kv[1]))[0]
-
-        closest = closest_palette(query_rgb)
-        item_palette = closest_palette(item_rgb) if item_rgb and len(item_rgb) == 3 else None
+        closest = JobService._closest_palette(tuple(query_rgb))
+        item_palette = JobService._closest_palette(tuple(item_rgb)) if item_rgb and len(item_rgb) == 3 else None
         if item_palette is None and item_colors:
             item_palette = item_colors[0]
         if item_palette == closest:
             class_score = 1.0
         else:
             class_score = 0.2
-        neighborhood = {
-            "navy": {"blue"},
-            "blue": {"navy"},
-            "brown": {"beige", "khaki"},
-            "beige": {"brown", "khaki"},
-            "khaki": {"brown", "beige"},
-            "black": {"gray"},
-            "gray": {"black", "white"},
-            "white": {"gray"},
-        }
-        if item_palette and item_palette in neighborhood.get(closest, set()):
+        if item_palette and item_palette in COLOR_NEIGHBORHOOD.get(closest, ()):
             class_score = max(class_score, 0.75)
         if item_colors and closest in item_colors:
             class_score = max(class_score, 0.92)
@@ -1951,20 +2647,46 @@ class JobService:
             if closest in {"navy", "brown"} and ("black" in item_colors or "gray" in item_colors):
                 class_score *= 0.75
         if item_rgb and len(item_rgb) == 3:
-            rgb_score = max(0.0, min(1.0, 1.0 - (color_dist(query_rgb, item_rgb) / math.sqrt(3.0))))
+            rgb_score = max(0.0, min(1.0, 1.0 - (math.dist(query_rgb, item_rgb) / math.sqrt(3.0))))
         elif item_palette:
-            rgb_score = max(0.0, min(1.0, 1.0 - (color_dist(query_rgb, palette[item_palette]) / math.sqrt(3.0))))
+            rgb_score = max(0.0, min(1.0, 1.0 - (math.dist(query_rgb, COLOR_PALETTE[item_palette]) / math.sqrt(3.0))))
         else:
             rgb_score = 0.6
         return (0.55 * class_score) + (0.45 * rgb_score)
 
-    def _embedding_from_text(self, text: str) -> list[float]:
+    # The query color is fixed for a whole search and item colors come from cached
+    # signatures and names, so palette lookups and alias scans are memoized.
+    @staticmethod
+    @functools.lru_cache(maxsize=ITEM_SIGNATURE_CACHE_SIZE)
+    def _closest_palette(rgb: tuple[float, ...]) -> str:
+        r, g, b = rgb
+        brightness = (r + g + b) / 3.0
+        if brightness < 0.26:
+            if b > (r + 0.015) and b > (g + 0.012):
+                return "navy"
+            if abs(r - g) < 0.03 and abs(g - b) < 0.03:
+                return "black"
+        return min(COLOR_PALETTE.items(), key=lambda kv: math.dist(rgb, kv[1]))[0]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=ITEM_SIGNATURE_CACHE_SIZE)
+    def _name_colors(name: str) -> tuple[str, ...]:
+        return tuple(canonical for token, canonical in COLOR_ALIASES.items() if token in name)
+
+    @staticmethod
+    def _embedding_from_text(text: str) -> list[float]:
         if not text:
             return [0.0] * 48
+        raw = text.encode("utf-8")
+        if np is not None:
+            codes = np.frombuffer(raw, dtype=np.uint8)
+            weights = (codes % 31) / 31.0
+            bins_arr = np.bincount(np.arange(codes.size) % 48, weights=weights, minlength=48)
+            return JobService._normalize_vector(bins_arr.tolist())
         bins = [0.0] * 48
-        for idx, ch in enumerate(text.encode("utf-8")):
+        for idx, ch in enumerate(raw):
             bins[idx % 48] += (ch % 31) / 31.0
-        return self._normalize_vector(bins)
+        return JobService._normalize_vector(bins)
 
     def _embedding_from_file(self, path_text: Optional[str]) -> list[float]:
         if not path_text or Image is None:
@@ -1981,6 +2703,8 @@ class JobService:
     @staticmethod
     def _style_signature_from_image(img: "Image.Image") -> tuple[list[float], float, float]:
         rgb = img.convert("RGB").resize((48, 48))
+        if np is not None:
+            return JobService._style_signature_from_array(rgb)
         pixels = list(rgb.getdata())
         if not pixels:
             return [0.0, 0.0, 0.0], 0.0, 0.0
@@ -2024,21 +2748,83 @@ class JobService:
         edge_density = (sum(edge_vals) / max(1.0, len(edge_vals))) / 255.0
         return mean_rgb, sat_mean, edge_density
 
+    @staticmethod
+    def _style_signature_from_array(rgb: "Image.Image") -> tuple[list[float], float, float]:
+        # Array form of the per-pixel loop in _style_signature_from_image, same weighting and masks.
+        px = np.asarray(rgb, dtype=np.float64)
+        h, w = px.shape[:2]
+        r, g, b = px[..., 0], px[..., 1], px[..., 2]
+        maxc = np.maximum(np.maximum(r, g), b) / 255.0
+        minc = np.minimum(np.minimum(r, g), b) / 255.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sat = np.where(maxc > minc, (maxc - minc) / maxc, 0.0)
+        weight = JobService._style_center_weights(w, h)
+        # Drop near-white background and very dark noise.
+        keep = ~(((r > 245) & (g > 245) & (b > 245)) | ((r < 28) & (g < 28) & (b < 28)))
+        if not keep.any():
+            keep = np.ones_like(keep)
+            weight = np.ones_like(weight)
+        weight = weight[keep]
+        total = float(weight.sum())
+        mean_rgb = [float((channel[keep] * weight).sum()) / (255.0 * total) for channel in (r, g, b)]
+        sat_mean = float((sat[keep] * weight).sum()) / total
+
+        if ImageFilter is not None:
+            edges = rgb.convert("L").filter(ImageFilter.FIND_EDGES)
+        else:
+            edges = rgb.convert("L")
+        edge_vals = np.asarray(edges, dtype=np.float64)
+        edge_density = (float(edge_vals.sum()) / max(1.0, edge_vals.size)) / 255.0
+        return mean_rgb, sat_mean, edge_density
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _style_center_weights(w: int, h: int) -> "np.ndarray":
+        # Signatures are taken at a fixed 48x48, so the center-weight grid is built once; callers only read it.
+        nx = (np.arange(w) / max(1, w - 1)) - 0.5
+        ny = (np.arange(h) / max(1, h - 1)) - 0.5
+        return np.maximum(0.2, 1.0 - (nx[np.newaxis, :] ** 2 + ny[:, np.newaxis] ** 2) * 1.8)
+
+    @staticmethod
+    def _load_style_signature(sig_path: Path, cache_path: Path) -> Optional[tuple[list[float], float, float]]:
+        # A signature older than its image belongs to a replaced download and is recomputed.
+        try:
+            if sig_path.stat().st_mtime_ns < cache_path.stat().st_mtime_ns:
+                return None
+            values = array.array("d")
+            values.frombytes(sig_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if len(values) != 5:
+            return None
+        return [values[0], values[1], values[2]], values[3], values[4]
+
     def _item_style_signature(self, item: CatalogItemRecord) -> tuple[list[float], float, float]:
-        cached = self._item_style_signature_cache.get(item.product_id)
-        if cached is not None:
-            return cached
+        with self._item_style_signature_lock:
+            cached = self._item_style_signature_cache.get(item.product_id)
+            if cached is not None:
+                self._item_style_signature_cache.move_to_end(item.product_id)
+                return cached
         cache_path = self._catalog_cache_dir / f"{self._product_id_from_url(item.image_url)}.img"
-        if not cache_path.exists() or Image is None:
-            signature = ([0.0, 0.0, 0.0], 0.0, 0.0)
+        signature: tuple[list[float], float, float] = ([0.0, 0.0, 0.0], 0.0, 0.0)
+        if cache_path.exists() and Image is not None:
+            # Signatures are saved next to the cached image so restarts skip the decode.
+            sig_path = cache_path.with_suffix(".sig")
+            stored = self._load_style_signature(sig_path, cache_path)
+            if stored is not None:
+                signature = stored
+            else:
+                try:
+                    with Image.open(cache_path) as img:
+                        signature = self._style_signature_from_image(img)
+                    mean_rgb, sat_mean, edge_density = signature
+                    self._write_file_atomic(sig_path, array.array("d", [*mean_rgb, sat_mean, edge_density]).tobytes())
+                except Exception:
+                    pass
+        with self._item_style_signature_lock:
             self._item_style_signature_cache[item.product_id] = signature
-            return signature
-        try:
-            with Image.open(cache_path) as img:
-                signature = self._style_signature_from_image(img)
-        except Exception:
-            signature = ([0.0, 0.0, 0.0], 0.0, 0.0)
-        self._item_style_signature_cache[item.product_id] = signature
+            while len(self._item_style_signature_cache) > ITEM_SIGNATURE_CACHE_SIZE:
+                self._item_style_signature_cache.popitem(last=False)
         return signature
 
     def _query_style_signatures_by_category(
@@ -2050,33 +2836,42 @@ class JobService:
         if not path.exists():
             return {}
         try:
-            with Image.open(path) as img:
-                rgb = img.convert("RGB")
-                width, height = rgb.size
-                if width < 16 or height < 16:
-                    base = self._style_signature_from_image(rgb)
-                    return {"global": base}
-
-                def crop_box(x1: float, y1: float, x2: float, y2: float) -> tuple[int, int, int, int]:
-                    left = max(0, min(width - 1, int(width * x1)))
-                    top = max(0, min(height - 1, int(height * y1)))
-                    right = max(left + 1, min(width, int(width * x2)))
-                    bottom = max(top + 1, min(height, int(height * y2)))
-                    return (left, top, right, bottom)
-
-                out: dict[str, tuple[list[float], float, float]] = {}
-                out["global"] = self._style_signature_from_image(rgb)
-                out["top"] = self._style_signature_from_image(rgb.crop(crop_box(0.10, 0.05, 0.90, 0.46)))
-                out["bottom"] = self._style_signature_from_image(rgb.crop(crop_box(0.16, 0.40, 0.84, 0.78)))
-                out["outer"] = self._style_signature_from_image(rgb.crop(crop_box(0.06, 0.02, 0.94, 0.60)))
-                out["shoes"] = self._style_signature_from_image(rgb.crop(crop_box(0.15, 0.80, 0.85, 0.99)))
-                left_sig = self._style_signature_from_image(rgb.crop(crop_box(0.00, 0.25, 0.38, 0.80)))
-                right_sig = self._style_signature_from_image(rgb.crop(crop_box(0.62, 0.25, 1.00, 0.80)))
-                bag_rgb = [(a + b) / 2.0 for a, b in zip(left_sig[0], right_sig[0])]
-                bag_sat = (left_sig[1] + right_sig[1]) / 2.0
-                bag_edge = (left_sig[2] + right_sig[2]) / 2.0
-                out["bag"] = (bag_rgb, bag_sat, bag_edge)
-                return out
+            rgb = self._upload_rgb(path)
+            width, height = rgb.size
+            if width < 16 or height < 16:
+                base = self._style_signature_from_image(rgb)
+                return {"global": base}
+
+            def crop_box(x1: float, y1: float, x2: float, y2: float) -> tuple[int, int, int, int]:
+                left = max(0, min(width - 1, int(width * x1)))
+                top = max(0, min(height - 1, int(height * y1)))
+                right = max(left + 1, min(width, int(width * x2)))
+                bottom = max(top + 1, min(height, int(height * y2)))
+                return (left, top, right, bottom)
+
+            def signature(box: Optional[tuple[float, float, float, float]]) -> tuple[list[float], float, float]:
+                return self._style_signature_from_image(rgb if box is None else rgb.crop(crop_box(*box)))
+
+            boxes: dict[str, Optional[tuple[float, float, float, float]]] = {
+                "global": None,
+                "top": (0.10, 0.05, 0.90, 0.46),
+                "bottom": (0.16, 0.40, 0.84, 0.78),
+                "outer": (0.06, 0.02, 0.94, 0.60),
+                "shoes": (0.15, 0.80, 0.85, 0.99),
+                "bag_left": (0.00, 0.25, 0.38, 0.80),
+                "bag_right": (0.62, 0.25, 1.00, 0.80),
+            }
+            futures = {name: self._roi_executor.submit(signature, box) for name, box in boxes.items()}
+            out: dict[str, tuple[list[float], float, float]] = {
+                name: futures[name].result() for name in ("global", "top", "bottom", "outer", "shoes")
+            }
+            left_sig = futures["bag_left"].result()
+            right_sig = futures["bag_right"].result()
+            bag_rgb = [(a + b) / 2.0 for a, b in zip(left_sig[0], right_sig[0])]
+            bag_sat = (left_sig[1] + right_sig[1]) / 2.0
+            bag_edge = (left_sig[2] + right_sig[2]) / 2.0
+            out["bag"] = (bag_rgb, bag_sat, bag_edge)
+            return out
         except Exception:
             return {}
 
@@ -2174,20 +2969,34 @@ class JobService:
             self._item_semantic_embedding_cache[item.product_id] = vec
         return vec
 
+    def _image_client(self) -> "httpx.Client":
+        with self._image_http_client_lock:
+            if self._image_http_client is None:
+                self._image_http_client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=6.0,
+                    headers={"User-Agent": "Mozilla/5.0"},
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                )
+            return self._image_http_client
+
+    def _close_image_http_client(self) -> None:
+        with self._image_http_client_lock:
+            client, self._image_http_client = self._image_http_client, None
+        if client is not None:
+            client.close()
+
     def _embedding_from_url(self, image_url: str, client: Optional["httpx.Client"] = None) -> list[float]:
         if Image is None or httpx is None:
             return []
         cache_path = self._catalog_cache_dir / f"{self._product_id_from_url(image_url)}.img"
         try:
             if not cache_path.exists():
-                if client is None:
-                    with httpx.Client(timeout=4.0, headers={"User-Agent": "Mozilla/5.0"}) as temp_client:
-                        resp = temp_client.get(image_url)
-                else:
-                    resp = client.get(image_url)
+                resp = (client or self._image_client()).get(image_url)
                 if resp.status_code != 200 or not resp.content:
                     return []
-                cache_path.write_bytes(resp.content)
+                # Concurrent embedders may share an image URL; never expose a half-written file.
+                self._write_file_atomic(cache_path, resp.content)
             with Image.open(cache_path) as img:
                 return self._primary_embedding_from_image(img)
         except Exception:
@@ -2201,34 +3010,39 @@ class JobService:
         return self._embedding_from_image(img)
 
     def _embedding_from_image(self, img: "Image.Image") -> list[float]:
+        if HIST_EMBED_FUSED_RESAMPLE:
+            # Let libjpeg decode at a reduced scale; no-op for other formats and loaded images.
+            img.draft("RGB", (96, 96))
         rgb = img.convert("RGB")
         hist_img = rgb.resize((96, 96))
-        px = list(hist_img.getdata())
-        # Ignore near-white background pixels common in e-commerce cutouts.
-        masked = [p for p in px if not (p[0] > 245 and p[1] > 245 and p[2] > 245)]
-        if len(masked) < 800:
-            masked = px
+        # Fused mode derives every feature from the 96x96 image instead of resampling the full one.
+        feature_src = hist_img if HIST_EMBED_FUSED_RESAMPLE else rgb
         bins_per_channel = 16
         channel_chunk = max(1, 256 // bins_per_channel)
-        hist_bins = [[0.0 for _ in range(bins_per_channel)] for _ in range(3)]
-        for r, g, b in masked:
-            hist_bins[0][min(bins_per_channel - 1, r // channel_chunk)] += 1.0
-            hist_bins[1][min(bins_per_channel - 1, g // channel_chunk)] += 1.0
-            hist_bins[2][min(bins_per_channel - 1, b // channel_chunk)] += 1.0
-        vec: list[float] = [v for channel in hist_bins for v in channel]
+        # Ignore near-white background pixels common in e-commerce cutouts. The mask and
+        # the 768-value band histogram are both computed by PIL in C.
+        near_white = [band.point(NEAR_WHITE_LUT) for band in hist_img.split()]
+        keep = ImageChops.invert(ImageChops.darker(ImageChops.darker(near_white[0], near_white[1]), near_white[2]))
+        mask = keep if keep.histogram()[255] >= 800 else None
+        band_hist = hist_img.histogram(mask)
+        vec = [float(sum(band_hist[start : start + channel_chunk])) for start in range(0, 768, channel_chunk)]
 
         # Add coarse spatial features for better shape/region discrimination.
-        spatial = rgb.resize((8, 8))
-        spatial_px = list(spatial.getdata())
-        for r, g, b in spatial_px:
-            vec.extend([r / 255.0, g / 255.0, b / 255.0])
+        spatial = feature_src.resize((8, 8))
+        if np is not None:
+            vec.extend((np.asarray(spatial, dtype=np.float64).reshape(-1) / 255.0).tolist())
+        else:
+            for r, g, b in spatial.getdata():
+                vec.extend([r / 255.0, g / 255.0, b / 255.0])
 
         # Add edge distribution to reduce plain color overfitting.
         if ImageFilter is not None:
-            edge = rgb.convert("L").filter(ImageFilter.FIND_EDGES)
+            edge = feature_src.convert("L").filter(ImageFilter.FIND_EDGES)
         else:
-            edge = rgb.convert("L")
-        edge_hist = edge.resize((96, 96)).histogram()
+            edge = feature_src.convert("L")
+        if edge.size != (96, 96):
+            edge = edge.resize((96, 96))
+        edge_hist = edge.histogram()
         edge_bins = 16
         edge_chunk = 256 // edge_bins
         for i in range(edge_bins):
@@ -2240,11 +3054,27 @@ class JobService:
 
     @staticmethod
     def _normalize_vector(vec: list[float]) -> list[float]:
+        if np is not None and len(vec) >= NUMPY_VECTOR_MIN_LEN:
+            arr = np.asarray(vec, dtype=np.float64)
+            norm = float(np.linalg.norm(arr))
+            if norm == 0:
+                return vec
+            return (arr / norm).tolist()
         norm = math.sqrt(sum(v * v for v in vec))
         if norm == 0:
             return vec
         return [v / norm for v in vec]
 
+    def _fallback_items_by_category(self) -> dict[str, list[CatalogItemRecord]]:
+        # Built once for searches, which only read these records; crawl paths that
+        # store fallback items in the catalog keep calling _fallback_catalog_items.
+        if self._fallback_pool is None:
+            pool: dict[str, list[CatalogItemRecord]] = {}
+            for item in self._fallback_catalog_items():
+                pool.setdefault(item.category, []).append(item)
+            self._fallback_pool = pool
+        return self._fallback_pool
+
     def _fallback_catalog_items(self) -> list[CatalogItemRecord]:
         categories = ["outer", "top", "bottom", "shoes", "bag"]
         category_ko = {
@@ -2260,7 +3090,7 @@ class JobService:
                 ko = category_ko.get(category, category)
                 query = f"{ko} 코디"
                 url = self._musinsa_search_url(query)
-                seed_vec = self._embedding_from_text(query)
+                seed_vec = self._fallback_seed_embedding(query)
                 items.append(
                     CatalogItemRecord(
                         product_id=f"fallback-{category}-{idx}",
@@ -2276,6 +3106,12 @@ class JobService:
                 )
         return items
 
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _fallback_seed_embedding(query: str) -> tuple[float, ...]:
+        # Seeds are fixed strings; records still get their own arrays since crawls insert them.
+        return tuple(JobService._embedding_from_text(query))
+
     @staticmethod
     def _musinsa_search_url(query: str) -> str:
         return f"https://www.musinsa.com/search/goods?keyword={quote_plus(query)}"
@@ -2285,7 +3121,11 @@ class JobService:
         upload_path = self._uploads_dir / f"{job_id}{ext}"
         preview_path = self._previews_dir / f"{job_id}.jpg"
         upload_path.write_bytes(image_bytes)
-        shutil.copyfile(upload_path, preview_path)
+        # The preview is the untouched upload, so share its inode instead of writing the bytes twice.
+        try:
+            os.link(upload_path, preview_path)
+        except OSError:
+            preview_path.write_bytes(image_bytes)
         return upload_path
 
     @staticmethod
@@ -2349,8 +3189,14 @@ class JobService:
             "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2,format=yuv420p",
             "-c:v",
             "libx264",
+            "-preset",
+            RENDER_X264_PRESET,
+            "-tune",
+            "stillimage",
             "-c:a",
             "aac",
+            "-movflags",
+            "+faststart",
             "-shortest",
             str(output),
         ]
@@ -2395,7 +3241,11 @@ class JobService:
             },
         }
 
-        media = MediaFileUpload(str(video_path), chunksize=-1, resumable=True, mimetype="video/mp4")
+        chunk_size = -1
+        if 0 < YOUTUBE_UPLOAD_CHUNK_SIZE < video_path.stat().st_size:
+            # Resumable chunks must be multiples of 256 KiB.
+            chunk_size = max(YOUTUBE_UPLOAD_CHUNK_SIZE // (256 * 1024), 1) * 256 * 1024
+        media = MediaFileUpload(str(video_path), chunksize=chunk_size, resumable=True, mimetype="video/mp4")
         request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
 
         response = None
@@ -2410,19 +3260,29 @@ class JobService:
         if not self._state_file.exists():
             return
         try:
-            payload = json.loads(self._state_file.read_text(encoding="utf-8"))
+            payload = self._read_json_file(self._state_file)
         except (OSError, ValueError):
             return
 
         jobs_payload = payload.get("jobs", [])
         idem_payload = payload.get("idempotency_map", {})
         catalog_payload = payload.get("catalog", [])
+        if self._catalog_file.exists():
+            try:
+                catalog_payload = self._read_json_file(self._catalog_file)
+            except (OSError, ValueError):
+                pass
+        elif catalog_payload:
+            # Older state files carried the catalog inline; move it to its sidecar on the next write.
+            self._catalog_dirty = True
         crawl_jobs_payload = payload.get("crawl_jobs", [])
         last_incremental_at = payload.get("last_incremental_at")
         last_full_reindex_at = payload.get("last_full_reindex_at")
         for raw in jobs_payload:
             try:
-                rec = self._record_from_dict(raw)
+                # Jobs written before gender targeting carry no target_gender.
+                raw["target_gender"] = self._coerce_gender(raw.get("target_gender", DEFAULT_TARGET_GENDER), TargetGender.men)
+                rec = JOB_RECORD_ADAPTER.validate_python(raw)
             except Exception:
                 continue
             self._jobs[rec.job_id] = rec
@@ -2439,9 +3299,14 @@ class JobService:
             except Exception:
                 continue
             self._catalog[item.product_id] = item
+        if self._embeddings_file.exists():
+            self._load_embeddings()
+        elif self._catalog:
+            # Older state files carried embeddings inline; move them to the sidecar on the next write.
+            self._catalog_dirty = True
         for raw in crawl_jobs_payload:
             try:
-                crawl = self._crawl_job_from_dict(raw)
+                crawl = CRAWL_JOB_RECORD_ADAPTER.validate_python(raw)
             except Exception:
                 continue
             self._crawl_jobs[crawl.crawl_job_id] = crawl
@@ -2456,79 +3321,178 @@ class JobService:
             except Exception:
                 self._last_full_reindex_at = None
 
+    def flush(self) -> None:
+        """Write pending state to disk now instead of waiting for the flusher thread."""
+        with self._state_write_lock:
+            with self._lock:
+                if not self._state_dirty:
+                    return
+                if not self._closing:
+                    self._state_dirty_event.clear()
+                # Dirty flags are only cleared once the snapshot exists; if serializing raises,
+                # the next mutation or flush() tries again.
+                data = self._serialize_state_locked()
+                catalog = self._serialize_catalog_locked() if self._catalog_dirty else None
+                embeddings = self._serialize_embeddings_locked() if self._catalog_dirty else None
+                self._state_dirty = False
+                self._catalog_dirty = False
+            try:
+                # Sidecars first, so the state file never references catalog data that is not on disk yet.
+                if catalog is not None:
+                    self._write_file_atomic(self._catalog_file, self._compress_state(catalog), durable=True)
+                if embeddings is not None:
+                    self._write_file_atomic(self._embeddings_file, embeddings, durable=True)
+                digest = hashlib.blake2b(data, digest_size=16).digest()
+                if digest == self._state_digest:
+                    # Nothing observable changed since the last write (e.g. a no-op mutation).
+                    return
+                self._write_file_atomic(self._state_file, self._compress_state(data), durable=True)
+                self._state_digest = digest
+            except Exception:
+                # Stay dirty so the next mutation or flush() retries the write.
+                with self._lock:
+                    self._state_dirty = True
+                    self._catalog_dirty = self._catalog_dirty or embeddings is not None
+                raise
+
+    @staticmethod
+    def _compress_state(data: bytes) -> bytes:
+        if zstandard is None or STATE_ZSTD_LEVEL <= 0:
+            return data
+        return zstandard.ZstdCompressor(level=STATE_ZSTD_LEVEL).compress(data)
+
+    @staticmethod
+    def _read_json_file(path: Path) -> object:
+        data = path.read_bytes()
+        if data.startswith(ZSTD_FRAME_MAGIC):
+            if zstandard is None:
+                # Refuse to start rather than treat the state as empty and overwrite it.
+                raise RuntimeError(f"{path} is zstd-compressed but zstandard is not installed")
+            try:
+                data = zstandard.ZstdDecompressor().decompress(data)
+            except zstandard.ZstdError as exc:
+                raise ValueError(f"corrupt zstd frame in {path}") from exc
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+    @staticmethod
+    def _write_file_atomic(path: Path, data: bytes, durable: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid4().hex}.tmp")
+        # Durable writes fsync the data before the rename and the directory after it, so a
+        # crash leaves either the old file or the complete new one. Rebuildable caches skip it.
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+            if durable:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        if durable and hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _state_flush_loop(self) -> None:
+        while True:
+            self._state_dirty_event.wait()
+            if self._closing:
+                # close() writes the final snapshot itself.
+                return
+            time.sleep(STATE_FLUSH_DELAY_SECONDS)
+            try:
+                self.flush()
+            except Exception:
+                # Keep the only flusher alive; the state stays dirty and is retried.
+                logger.exception("failed to persist job state to %s", self._state_file)
+
     def _persist_locked(self) -> None:
-        self._state_file.parent.mkdir(parents=True, exist_ok=True)
+        self._state_dirty = True
+        self._state_dirty_event.set()
+
+    def _persist_job_locked(self, record: JobRecord) -> None:
+        # Any change to a job, including in-place edits of its items, drops its cached payload.
+        record.state_payload = None
+        self._persist_locked()
+
+    def _persist_catalog_locked(self) -> None:
+        self._catalog_dirty = True
+        self._catalog_version += 1
+        self._persist_locked()
+
+    def _serialize_embeddings_locked(self) -> bytes:
+        chunks = [EMBEDDINGS_FILE_MAGIC]
+        for item in self._catalog.values():
+            if not item.embedding:
+                continue
+            product_id = item.product_id.encode("utf-8")
+            values = item.embedding
+            if sys.byteorder != "little":
+                values = array.array("f", values)
+                values.byteswap()
+            chunks.append(EMBEDDINGS_RECORD_HEADER.pack(len(product_id), len(values)))
+            chunks.append(product_id)
+            chunks.append(values.tobytes())
+        return b"".join(chunks)
+
+    def _load_embeddings(self) -> None:
+        try:
+            data = self._embeddings_file.read_bytes()
+        except OSError:
+            return
+        if not data.startswith(EMBEDDINGS_FILE_MAGIC):
+            return
+        view = memoryview(data)
+        offset = len(EMBEDDINGS_FILE_MAGIC)
+        while offset + EMBEDDINGS_RECORD_HEADER.size <= len(view):
+            id_len, dim = EMBEDDINGS_RECORD_HEADER.unpack_from(view, offset)
+            offset += EMBEDDINGS_RECORD_HEADER.size
+            end = offset + id_len + dim * 4
+            if end > len(view):
+                break
+            product_id = bytes(view[offset : offset + id_len]).decode("utf-8")
+            embedding = array.array("f")
+            embedding.frombytes(view[offset + id_len : end])
+            if sys.byteorder != "little":
+                embedding.byteswap()
+            offset = end
+            item = self._catalog.get(product_id)
+            if item is not None:
+                item.embedding = embedding
+
+    def _serialize_state_locked(self) -> bytes:
         payload = {
-            "jobs": [self._record_to_dict(r) for r in self._jobs.values()],
-            "idempotency_map": {k: str(v) for k, v in self._idempotency_map.items()},
-            "catalog": [self._catalog_item_to_dict(item) for item in self._catalog.values()],
-            "crawl_jobs": [self._crawl_job_to_dict(job) for job in self._crawl_jobs.values()],
-            "last_incremental_at": self._last_incremental_at.isoformat() if self._last_incremental_at else None,
-            "last_full_reindex_at": self._last_full_reindex_at.isoformat() if self._last_full_reindex_at else None,
+            "jobs": [r.state_payload or self._job_state_payload(r) for r in self._jobs.values()],
+            "idempotency_map": self._idempotency_map,
+            "crawl_jobs": CRAWL_JOB_RECORD_LIST_ADAPTER.dump_python(list(self._crawl_jobs.values()), mode="json"),
+            "last_incremental_at": self._last_incremental_at,
+            "last_full_reindex_at": self._last_full_reindex_at,
         }
-        tmp_path = self._state_file.with_suffix(f".{uuid4().hex}.tmp")
-        tmp_path.write_text(json.dumps(payload, ensure_ascii=True), encoding="utf-8")
-        tmp_path.replace(self._state_file)
+        # UUIDs and datetimes are left to the encoder: orjson writes them natively in the
+        # same str()/isoformat() forms the stdlib fallback produces through _json_default.
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=True, default=JobService._json_default).encode("utf-8")
 
     @staticmethod
-    def _record_to_dict(record: JobRecord) -> dict:
-        return {
-            "job_id": str(record.job_id),
-            "status": record.status.value,
-            "quality_mode": record.quality_mode.value,
-            "target_gender": record.target_gender.value,
-            "look_count": record.look_count,
-            "created_at": record.created_at.isoformat(),
-            "completed_at": record.completed_at.isoformat() if record.completed_at else None,
-            "progress": record.progress,
-            "theme": record.theme,
-            "tone": record.tone,
-            "items": [item.model_dump(mode="json") for item in record.items],
-            "preview_url": record.preview_url,
-            "video_url": record.video_url,
-            "failure_code": record.failure_code.value if record.failure_code else None,
-            "had_partial_match": record.had_partial_match,
-            "parent_job_id": str(record.parent_job_id) if record.parent_job_id else None,
-            "attempts": record.attempts,
-            "idempotency_key": record.idempotency_key,
-            "upload_image_path": record.upload_image_path,
-            "youtube_video_id": record.youtube_video_id,
-            "youtube_url": record.youtube_url,
-            "youtube_upload_status": record.youtube_upload_status.value,
-            "roi_debug": {k: v.model_dump(mode="json") for k, v in record.roi_debug.items()},
-        }
+    def _job_state_payload(record: JobRecord) -> dict:
+        payload = JOB_RECORD_ADAPTER.dump_python(record, mode="json", exclude={"state_payload"})
+        record.state_payload = payload
+        return payload
+
+    def _serialize_catalog_locked(self) -> bytes:
+        payload = [self._catalog_item_to_dict(item) for item in self._catalog.values()]
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=True).encode("utf-8")
 
     @staticmethod
-    def _record_from_dict(raw: dict) -> JobRecord:
-        return JobRecord(
-            job_id=UUID(raw["job_id"]),
-            status=JobStatus(raw["status"]),
-            quality_mode=QualityMode(raw["quality_mode"]),
-            target_gender=JobService._coerce_gender(raw.get("target_gender", DEFAULT_TARGET_GENDER), TargetGender.men),
-            look_count=int(raw["look_count"]),
-            created_at=datetime.fromisoformat(raw["created_at"]),
-            completed_at=datetime.fromisoformat(raw["completed_at"]) if raw.get("completed_at") else None,
-            progress=int(raw.get("progress", 0)),
-            theme=raw.get("theme"),
-            tone=raw.get("tone"),
-            items=[MatchItem.model_validate(item) for item in raw.get("items", [])],
-            preview_url=raw.get("preview_url"),
-            video_url=raw.get("video_url"),
-            failure_code=FailureCode(raw["failure_code"]) if raw.get("failure_code") else None,
-            had_partial_match=bool(raw.get("had_partial_match", False)),
-            parent_job_id=UUID(raw["parent_job_id"]) if raw.get("parent_job_id") else None,
-            attempts=int(raw.get("attempts", 1)),
-            idempotency_key=raw.get("idempotency_key"),
-            upload_image_path=raw.get("upload_image_path"),
-            youtube_video_id=raw.get("youtube_video_id"),
-            youtube_url=raw.get("youtube_url"),
-            youtube_upload_status=YouTubeUploadStatus(raw.get("youtube_upload_status", YouTubeUploadStatus.PENDING.value)),
-            roi_debug={
-                str(key): RoiRegion.model_validate(value)
-                for key, value in (raw.get("roi_debug") or {}).items()
-                if isinstance(value, dict)
-            },
-        )
+    def _json_default(value: object) -> str:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, UUID):
+            return str(value)
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
 
     @staticmethod
     def _catalog_item_to_dict(item: CatalogItemRecord) -> dict:
@@ -2541,7 +3505,6 @@ class JobService:
             "image_url": item.image_url,
             "price": item.price,
             "gender": item.gender.value,
-            "embedding": item.embedding,
             "updated_at": item.updated_at.isoformat(),
         }
 
@@ -2556,32 +3519,14 @@ class JobService:
             image_url=str(raw.get("image_url") or ""),
             price=int(raw["price"]) if raw.get("price") is not None else None,
             gender=JobService._coerce_gender(raw.get("gender", TargetGender.unisex.value), TargetGender.unisex),
-            embedding=[float(v) for v in raw.get("embedding", [])],
+            embedding=JobService._embedding_from_state(raw.get("embedding")),
             updated_at=datetime.fromisoformat(raw["updated_at"]) if raw.get("updated_at") else datetime.now(timezone.utc),
         )
 
     @staticmethod
-    def _crawl_job_to_dict(job: CrawlJobRecord) -> dict:
-        return {
-            "crawl_job_id": str(job.crawl_job_id),
-            "status": job.status.value,
-            "mode": job.mode.value,
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "total_discovered": job.total_discovered,
-            "total_indexed": job.total_indexed,
-            "error_message": job.error_message,
-        }
-
-    @staticmethod
-    def _crawl_job_from_dict(raw: dict) -> CrawlJobRecord:
-        return CrawlJobRecord(
-            crawl_job_id=UUID(raw["crawl_job_id"]),
-            status=CrawlJobStatus(raw["status"]),
-            mode=CrawlMode(raw.get("mode", CrawlMode.incremental.value)),
-            started_at=datetime.fromisoformat(raw["started_at"]) if raw.get("started_at") else None,
-            completed_at=datetime.fromisoformat(raw["completed_at"]) if raw.get("completed_at") else None,
-            total_discovered=int(raw.get("total_discovered", 0)),
-            total_indexed=int(raw.get("total_indexed", 0)),
-            error_message=raw.get("error_message"),
-        )
+    def _embedding_from_state(raw: list | None) -> array.array:
+        # Only state files that predate the embeddings sidecar carry embeddings inline, as JSON float lists.
+        embedding = array.array("f")
+        if raw:
+            embedding.extend(float(v) for v in raw)
+        return embedding
@@ -4,14 +4,16 @@ import io
 import tempfile
 import time
 from pathlib import Path
-from uuid import uuid4
+from types import SimpleNamespace
+from typing import Iterator
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app import main as api_main
-from app.models import JobStatus
-from app.service import JobService
+from app.models import JobStatus, QualityMode, TargetGender
+from app.service import CatalogItemRecord, JobService
 
 VALID_PNG_BYTES = (
     b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde"
@@ -20,10 +22,12 @@ VALID_PNG_BYTES = (
 
 
 @pytest.fixture
-def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
     state_file = Path(tempfile.mkdtemp(prefix="jobservice-test-")) / "job_state.json"
-    monkeypatch.setattr(api_main, "service", JobService(state_file=state_file, enable_real_render=False))
-    return TestClient(api_main.app)
+    service = JobService(state_file=state_file, enable_real_render=False)
+    monkeypatch.setattr(api_main, "service", service)
+    yield TestClient(api_main.app)
+    service.close()
 
 
 def _create_job(client: TestClient, quality_mode: str = "auto_gate", look_count: int = 3) -> str:
@@ -213,6 +217,14 @@ def test_create_job_validation_errors(client: TestClient) -> None:
         data={"look_count": "3", "quality_mode": "auto_gate"},
     )
     assert invalid_content_type.status_code == 422
+    assert invalid_content_type.json()["detail"] == "image content type must be image/*"
+
+    less_common_image_type = client.post(
+        "/v1/jobs",
+        files={"image": ("fit.bmp", io.BytesIO(VALID_PNG_BYTES), "image/bmp")},
+        data={"look_count": "3", "quality_mode": "auto_gate"},
+    )
+    assert less_common_image_type.status_code == 202
 
     oversized = client.post(
         "/v1/jobs",
@@ -222,6 +234,18 @@ def test_create_job_validation_errors(client: TestClient) -> None:
     assert oversized.status_code == 413
 
 
+def test_create_job_rejects_declared_oversized_body(client: TestClient) -> None:
+    oversized = client.post(
+        "/v1/jobs",
+        files={"image": ("fit.png", io.BytesIO(b"x" * (11 * 1024 * 1024)), "image/png")},
+        data={"look_count": "3", "quality_mode": "auto_gate"},
+        headers={"Origin": "http://localhost:3005"},
+    )
+    assert oversized.status_code == 413
+    assert oversized.json() == {"detail": "image too large (max 10MB)"}
+    assert oversized.headers["access-control-allow-origin"] == "*"
+
+
 def test_create_job_response_schema(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("app.service.random.random", lambda: 0.99)
     resp = client.post(
@@ -478,3 +502,159 @@ def test_history_item_shape(client: TestClient, monkeypatch: pytest.MonkeyPatch)
     assert isinstance(item["created_at"], str)
     assert "T" in item["created_at"]
     assert isinstance(item["completed_at"], str)
+
+
+def test_cors_preflight_and_simple_response_headers(client: TestClient) -> None:
+    preflight = client.options(
+        "/v1/jobs",
+        headers={"Origin": "http://localhost:3005", "Access-Control-Request-Method": "POST"},
+    )
+    assert preflight.status_code == 204
+    assert preflight.headers["access-control-allow-origin"] == "*"
+    assert preflight.headers["access-control-allow-methods"] == "*"
+
+    simple = client.get("/healthz", headers={"Origin": "http://localhost:3005"})
+    assert simple.status_code == 200
+    assert simple.headers["access-control-allow-origin"] == "*"
+
+    same_origin = client.get("/healthz")
+    assert "access-control-allow-origin" not in same_origin.headers
+
+
+def test_job_state_survives_restart_after_flush(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.service.random.random", lambda: 0.99)
+    job_id = _create_job(client, quality_mode="auto_gate", look_count=2)
+    detail = _wait_for_terminal(client, job_id)
+
+    api_main.service.flush()
+    restarted = JobService(state_file=api_main.service._state_file, enable_real_render=False)
+    reloaded = restarted.get_job(UUID(job_id))
+    restarted.close()
+    assert str(reloaded.job_id) == job_id
+    assert reloaded.status.value == detail["status"]
+    assert len(reloaded.items) == len(detail["items"])
+
+
+def test_qdrant_incremental_sync_pushes_catalog_items(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = api_main.service
+    item = CatalogItemRecord(
+        product_id="1001",
+        category="top",
+        brand="MUSINSA",
+        product_name="black knit",
+        product_url="https://www.musinsa.com/products/1001",
+        image_url="https://image.msscdn.net/images/goods_img/1001.jpg",
+        price=39000,
+        embedding=[0.6, 0.8],
+    )
+    assert JobService._qdrant_point_digest(item) == JobService._qdrant_point_digest(item)
+
+    upserted: list[dict] = []
+
+    class RecordingQdrant:
+        def upsert(self, collection_name: str, points: list[dict], wait: bool) -> None:
+            upserted.extend(points)
+
+    monkeypatch.setattr("app.service.qdrant_models", SimpleNamespace(PointStruct=lambda **point: point))
+    monkeypatch.setattr(service, "_qdrant_client", RecordingQdrant())
+    service._push_qdrant_changes([item])
+    assert [point["payload"]["updated_at"] for point in upserted] == [item.updated_at.isoformat()]
+    assert service._qdrant_point_digests[item.product_id] == JobService._qdrant_point_digest(item)
+
+    upserted.clear()
+    service._push_qdrant_changes([item])
+    assert upserted == []
+
+
+def test_state_stays_dirty_when_serialization_fails(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = api_main.service
+
+    def failing_serialize() -> bytes:
+        raise TypeError("not serializable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(service, "_serialize_state_locked", failing_serialize)
+        with service._lock:
+            service._persist_locked()
+        with pytest.raises(TypeError):
+            service.flush()
+    assert service._state_dirty
+
+    service.flush()
+    assert not service._state_dirty
+    assert service._state_file.exists()
+
+
+def test_in_place_job_item_edit_survives_restart(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.service.random.random", lambda: 0.99)
+    job_id = _create_job(client, quality_mode="auto_gate", look_count=2)
+    _wait_for_terminal(client, job_id)
+    service = api_main.service
+    service.flush()
+
+    with service._lock:
+        record = service._jobs[UUID(job_id)]
+        assert record.items and record.state_payload is not None
+        record.items[0].brand = "EDITED"
+        record.items.append(record.items[0].model_copy(update={"product_id": "appended"}))
+        service._persist_job_locked(record)
+    service.flush()
+
+    restarted = JobService(state_file=service._state_file, enable_real_render=False)
+    reloaded = restarted.get_job(UUID(job_id))
+    restarted.close()
+    assert reloaded.items[0].brand == "EDITED"
+    assert reloaded.items[-1].product_id == "appended"
+
+
+def test_pipeline_error_fails_job_and_close_stops_threads(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = api_main.service
+
+    def broken_search(**_: object) -> None:
+        raise RuntimeError("search backend down")
+
+    monkeypatch.setattr(service, "_search_catalog", broken_search)
+    job_id = _create_job(client, quality_mode="auto_gate", look_count=2)
+    detail = _wait_for_terminal(client, job_id)
+    assert detail["status"] == "FAILED"
+    assert detail["failure_code"] == "RENDER_ERROR"
+    assert service._jobs[UUID(job_id)].error_message == "RuntimeError: search backend down"
+    assert client.post(f"/v1/jobs/{job_id}/retry").status_code == 202
+
+    workers = [*service._pipeline_threads, service._flush_thread]
+    service.close()
+    assert not any(thread.is_alive() for thread in workers)
+
+
+def test_idempotency_race_loser_removes_its_upload_and_preview(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.service.random.random", lambda: 0.99)
+    service = api_main.service
+    save_upload = service._save_upload
+    saved: list[UUID] = []
+
+    def racing_save(job_id: UUID, image_bytes: bytes, image_content_type: str | None) -> Path:
+        path = save_upload(job_id, image_bytes, image_content_type)
+        saved.append(job_id)
+        if len(saved) == 1:
+            # A second request with the same key commits while the first is still writing files.
+            service.create_job(**job_args)
+        return path
+
+    job_args = dict(
+        look_count=1,
+        quality_mode=QualityMode.auto_gate,
+        target_gender=TargetGender.men,
+        theme=None,
+        tone=None,
+        image_bytes=VALID_PNG_BYTES,
+        image_content_type="image/png",
+        idempotency_key="race-key",
+    )
+    monkeypatch.setattr(service, "_save_upload", racing_save)
+    created = service.create_job(**job_args)
+
+    loser, winner = saved
+    assert created.job_id == winner
+    assert not (service.asset_root / "uploads" / f"{loser}.png").exists()
+    assert not (service.asset_root / "previews" / f"{loser}.jpg").exists()
+    assert (service.asset_root / "previews" / f"{winner}.jpg").exists()
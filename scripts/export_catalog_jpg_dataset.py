@@ -27,11 +27,30 @@ def _safe_name(value: str) -> str:
     return value[:120] if value else "item"
 
 
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    # The service zstd-compresses its state files when zstandard is installed.
+    if data.startswith(b"\x28\xb5\x2f\xfd"):
+        try:
+            import zstandard
+        except Exception as exc:  # pragma: no cover
+            raise SystemExit(
+                "zstandard is required to read compressed state. Install with: python3 -m pip install zstandard"
+            ) from exc
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+
 def _load_catalog(state_file: Path) -> list[dict[str, Any]]:
     if not state_file.exists():
         raise FileNotFoundError(f"state file not found: {state_file}")
-    payload = json.loads(state_file.read_text(encoding="utf-8"))
-    catalog = payload.get("catalog", [])
+    # The service keeps catalog metadata in a `<state>.catalog` sidecar; older state files inline it.
+    catalog_file = state_file.with_name(f"{state_file.name}.catalog")
+    if catalog_file.exists():
+        catalog = _read_json(catalog_file)
+    else:
+        payload = _read_json(state_file)
+        catalog = payload.get("catalog", [])
     if not isinstance(catalog, list):
         raise ValueError("invalid state file: `catalog` must be a list")
     return catalog